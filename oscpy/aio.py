@@ -0,0 +1,371 @@
+"""Asyncio API.
+
+This module implements `OSCAsyncServer` and `OSCAsyncClient`, using
+asyncio datagram endpoints instead of a listening thread, so messages are
+handled in the event loop of the application. Callbacks can be plain
+functions or coroutine functions, coroutines are run as tasks.
+
+This module requires python 3.7 or later.
+"""
+
+import asyncio
+import logging
+import socket
+from time import time
+
+from oscpy.parser import iter_packet, format_message, format_bundle
+from oscpy.server import OSCServerBase, MessageContext
+from oscpy.stats import Stats
+
+
+logger = logging.getLogger(__name__)
+
+
+class _ServerProtocol(asyncio.DatagramProtocol):
+    """Give the datagrams received by a transport to an `OSCAsyncServer`."""
+
+    def __init__(self, server):
+        self.server = server
+        self.transport = None
+
+    def connection_made(self, transport):
+        self.transport = transport
+
+    def datagram_received(self, data, addr):
+        self.server._receive(self.transport, addr, data)
+
+    def error_received(self, exc):
+        logger.error("Error received by oscpy server", exc_info=exc)
+
+
+class OSCAsyncServer(OSCServerBase):
+    """An asyncio based OSC server.
+
+    Sockets are asyncio datagram transports, created with the `listen`
+    coroutine, messages are dispatched to callbacks from the event loop
+    as soon as they are received.
+
+    See `OSCServerBase` for the methods binding callbacks to addresses,
+    `bind(..., process=True)` is not supported.
+    """
+
+    def __init__(
+        self, drop_late_bundles=False, advanced_matching=False,
+        encoding='', encoding_errors='strict', default_handler=None,
+        intercept_errors=True, validate_message_address=True,
+        zero_copy=False, numpy_arrays=False, match_cache_size=1024,
+        incoming_patterns=False
+    ):
+        """Create an OSCAsyncServer.
+
+        The parameters have the same meaning as for `OSCThreadServer`,
+        if `intercept_errors` is False, exceptions raised by callbacks
+        are given to the exception handler of the event loop.
+        """
+        super(OSCAsyncServer, self).__init__(
+            drop_late_bundles=drop_late_bundles,
+            advanced_matching=advanced_matching, encoding=encoding,
+            encoding_errors=encoding_errors, default_handler=default_handler,
+            intercept_errors=intercept_errors,
+            validate_message_address=validate_message_address,
+            zero_copy=zero_copy, numpy_arrays=numpy_arrays,
+            match_cache_size=match_cache_size,
+            incoming_patterns=incoming_patterns
+        )
+        self.sockets = []
+        self._tasks = set()
+
+    async def listen(
+        self, address='localhost', port=0, default=False, family='inet'
+    ):
+        """Start listening on an (address, port).
+
+        See `OSCThreadServer.listen` for the parameters, the created
+        transport is returned, and can be used later with methods
+        accepting the `sock` parameter.
+        """
+        if family == 'unix':
+            kwargs = {'local_addr': address, 'family': socket.AF_UNIX}
+        elif family == 'inet':
+            kwargs = {'local_addr': (address, port)}
+        else:
+            raise ValueError(
+                "Unknown socket family, accepted values are 'unix' and 'inet'"
+            )
+
+        if default and self.default_socket:
+            raise RuntimeError(
+                'Only one default socket authorized! Please set '
+                'default=False to other calls to listen()'
+            )
+
+        loop = asyncio.get_running_loop()
+        transport, _ = await loop.create_datagram_endpoint(
+            lambda: _ServerProtocol(self), **kwargs
+        )
+        self.sockets.append(transport)
+        if default:
+            self.default_socket = transport
+        self.bind_meta_routes(transport)
+        return transport
+
+    def getaddress(self, sock=None):
+        """Return the address a transport is bound to.
+
+        If `sock` is None, uses the default socket for the server.
+        """
+        if not sock and self.default_socket:
+            sock = self.default_socket
+        elif not sock:
+            raise RuntimeError('no default socket yet and no socket provided')
+
+        return sock.get_extra_info('sockname')
+
+    def stop(self, sock=None):
+        """Close and remove a transport from the server's sockets.
+
+        If `sock` is None, uses the default socket for the server.
+        """
+        if not sock and self.default_socket:
+            sock = self.default_socket
+
+        if sock not in self.sockets:
+            raise RuntimeError('{} is not one of my sockets!'.format(sock))
+
+        sock.close()
+        self.sockets.remove(sock)
+        if sock == self.default_socket:
+            self.default_socket = None
+
+    def stop_all(self):
+        """Call stop on all the existing sockets."""
+        for sock in self.sockets[:]:
+            self.stop(sock)
+
+    def _receive(self, sock, sender, data):
+        """(internal) Dispatch the messages of a received datagram."""
+        received = time()
+        try:
+            for timetag, message in iter_packet(
+                data, drop_late=self.drop_late_bundles,
+                encoding=self.encoding, encoding_errors=self.encoding_errors,
+                validate_message_address=self.validate_message_address,
+                zero_copy=self.zero_copy, lazy=True,
+                numpy_arrays=self.numpy_arrays
+            ):
+                self._dispatch(sock, sender, timetag, message, received)
+        except ValueError:
+            if self.intercept_errors:
+                logger.error(
+                    "Unhandled ValueError caught in oscpy server",
+                    exc_info=True
+                )
+            else:
+                raise
+
+    def _dispatch(self, sock, sender, timetag, message, received):
+        """(internal) Call the callbacks matching a message."""
+        callbacks_lists = self._route_message(sock, sender, message)
+        if callbacks_lists is None:
+            return
+
+        self._run_callbacks(
+            MessageContext(
+                sock, sender, message.address, timetag, message.data,
+                received
+            ),
+            callbacks_lists, message.values
+        )
+
+    def _call_callbacks(self, address, callbacks_lists, values):
+        """(internal) Call the callbacks resolved for a message.
+
+        Coroutines returned by callbacks are scheduled as tasks, which
+        inherit the context of the message, so `get_context` and
+        `get_sender` can be used in them.
+        """
+        for bound_address, callbacks_list in callbacks_lists:
+            for cb, get_address in callbacks_list:
+                try:
+                    if get_address:
+                        result = cb(bound_address, *values)
+                    else:
+                        result = cb(*values)
+                except Exception:
+                    if self.intercept_errors:
+                        logger.error(
+                            "Unhandled exception caught in oscpy server",
+                            exc_info=True
+                        )
+                        continue
+                    raise
+
+                self._schedule(result)
+
+        if not callbacks_lists:
+            self._schedule(self.default_handler(address, *values))
+
+    def _schedule(self, result):
+        """(internal) Run `result` as a task if it's awaitable."""
+        if not asyncio.iscoroutine(result):
+            return
+
+        # the task copies the current context
+        task = asyncio.ensure_future(result)
+        self._tasks.add(task)
+        task.add_done_callback(self._task_done)
+
+    def _task_done(self, task):
+        self._tasks.discard(task)
+        if task.cancelled() or task.exception() is None:
+            return
+
+        if self.intercept_errors:
+            logger.error(
+                "Unhandled exception caught in oscpy server",
+                exc_info=task.exception()
+            )
+        else:
+            # let the loop exception handler report it
+            task.result()
+
+    def _send(self, data, stats, ip_address, port, sock):
+        """(internal) Send formatted data using a transport."""
+        if not sock and self.default_socket:
+            sock = self.default_socket
+        elif not sock:
+            raise RuntimeError('no default socket yet and no socket provided')
+
+        if sock.get_extra_info('socket').family == socket.AF_UNIX:
+            sock.sendto(data, ip_address)
+        else:
+            sock.sendto(data, (ip_address, port))
+        self.stats_sent += stats
+        return stats
+
+    async def send_message(
+        self, osc_address, values, ip_address, port, sock=None
+    ):
+        """Send a message to (ip_address, port).
+
+        Use the `default_socket` of the server by default.
+        See `client.send_message` for more info about the parameters.
+        """
+        message, stats = format_message(
+            osc_address, values, encoding=self.encoding,
+            encoding_errors=self.encoding_errors
+        )
+        return self._send(message, stats, ip_address, port, sock)
+
+    async def send_bundle(
+        self, messages, ip_address, port, timetag=None, sock=None
+    ):
+        """Send a bundle to (ip_address, port).
+
+        Use the `default_socket` of the server by default.
+        See `client.send_bundle` for more info about the parameters.
+        """
+        bundle, stats = format_bundle(
+            messages, timetag=timetag, encoding=self.encoding,
+            encoding_errors=self.encoding_errors
+        )
+        return self._send(bundle, stats, ip_address, port, sock)
+
+    def answer(
+        self, address=None, values=None, bundle=None, timetag=None,
+        port=None
+    ):
+        """Answer a message or bundle to a client.
+
+        See `OSCThreadServer.answer` for the parameters, as sending
+        doesn't block with asyncio transports, this method doesn't need
+        to be awaited.
+        """
+        sock, ip_address, response_port = self.get_sender()
+
+        if port is not None:
+            response_port = port
+
+        if bundle:
+            data, stats = format_bundle(
+                bundle, timetag=timetag, encoding=self.encoding,
+                encoding_errors=self.encoding_errors
+            )
+        else:
+            data, stats = format_message(
+                address, values or [], encoding=self.encoding,
+                encoding_errors=self.encoding_errors
+            )
+        return self._send(data, stats, ip_address, response_port, sock)
+
+
+class OSCAsyncClient(object):
+    """Send messages to a server from asyncio code.
+
+    The transport is created by the first send, or when using the client
+    as an async context manager.
+    """
+
+    def __init__(self, address, port, encoding='', encoding_errors='strict'):
+        """Create an OSCAsyncClient.
+
+        `address` and `port` are the destination of messages sent
+        by this client. See `client.send_message` and
+        `client.send_bundle` documentation for more information.
+        """
+        self.address = address
+        self.port = port
+        self.encoding = encoding
+        self.encoding_errors = encoding_errors
+        self.stats = Stats()
+        self.transport = None
+        self._connection = None
+
+    async def connect(self):
+        """Create the transport used to send messages."""
+        if self._connection is None:
+            loop = asyncio.get_running_loop()
+            self._connection = asyncio.ensure_future(
+                loop.create_datagram_endpoint(
+                    asyncio.DatagramProtocol,
+                    remote_addr=(self.address, self.port)
+                )
+            )
+        self.transport, _ = await self._connection
+        return self
+
+    def close(self):
+        """Close the transport of the client."""
+        if self.transport is not None:
+            self.transport.close()
+        self.transport = None
+        self._connection = None
+
+    async def __aenter__(self):
+        return await self.connect()
+
+    async def __aexit__(self, *args):
+        self.close()
+
+    async def _send(self, data, stats):
+        if self.transport is None:
+            await self.connect()
+        self.transport.sendto(data)
+        self.stats += stats
+        return stats
+
+    async def send_message(self, address, values):
+        """Send a message, see `client.send_message`."""
+        message, stats = format_message(
+            address, values, encoding=self.encoding,
+            encoding_errors=self.encoding_errors
+        )
+        return await self._send(message, stats)
+
+    async def send_bundle(self, messages, timetag=None):
+        """Send a bundle, see `client.send_bundle`."""
+        bundle, stats = format_bundle(
+            messages, timetag=timetag, encoding=self.encoding,
+            encoding_errors=self.encoding_errors
+        )
+        return await self._send(bundle, stats)
@@ -0,0 +1,63 @@
+"Simple bounded LRU mapping, used to memoize parsing and matching work"
+
+from collections import OrderedDict, namedtuple
+from threading import Lock
+
+
+CacheInfo = namedtuple('CacheInfo', 'hits misses maxsize currsize')
+
+
+class LRUCache(object):
+    """A bounded mapping evicting its least recently used entries.
+
+    `get` counts hits and misses, which can be retrieved with `info`.
+    All the operations are protected by a lock, so the cache can be
+    shared between a server thread and threads sending messages.
+    """
+
+    def __init__(self, maxsize=128):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+        self._lock = Lock()
+
+    def get(self, key, default=None):
+        """Return the value for `key`, or `default` if it's not cached."""
+        with self._lock:
+            data = self._data
+            try:
+                value = data.pop(key)
+            except KeyError:
+                self.misses += 1
+                return default
+
+            data[key] = value
+            self.hits += 1
+            return value
+
+    def set(self, key, value):
+        """Store `value` for `key`, evicting the oldest entry if full."""
+        with self._lock:
+            data = self._data
+            data.pop(key, None)
+            data[key] = value
+            if len(data) > self.maxsize:
+                data.popitem(last=False)
+
+    __setitem__ = set
+
+    def __contains__(self, key):
+        return key in self._data
+
+    def __len__(self):
+        return len(self._data)
+
+    def clear(self):
+        """Drop all the entries, hit/miss counters are kept."""
+        with self._lock:
+            self._data.clear()
+
+    def info(self):
+        """Return a `CacheInfo` tuple describing the cache usage."""
+        return CacheInfo(self.hits, self.misses, self.maxsize, len(self._data))
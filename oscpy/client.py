@@ -2,9 +2,9 @@
 
 This module provides both a functional and an object oriented API.
 
-You can use directly `send_message`, `send_bundle` and the `SOCK` socket
-that is created by default, or use `OSCClient` to store parameters common
-to your requests and avoid repeating them in your code.
+You can use directly `send_message`, `send_bundle`, `send_prepared` and the
+`SOCK` socket that is created by default, or use `OSCClient` to store
+parameters common to your requests and avoid repeating them in your code.
 """
 
 import socket
@@ -72,6 +72,33 @@ def send_message(
     return stats
 
 
+def send_prepared(
+    prepared, values, ip_address, port, sock=SOCK, safer=False
+):
+    """Send a `PreparedMessage` with `values` to a socket address.
+
+    Only the values have to be packed, the address and type tags of the
+    message were encoded when it was prepared.
+
+    See `send_message` documentation for the other parameters.
+
+    example:
+        level = PreparedMessage(b'/mixer/ch/12/level', b'f')
+        send_prepared(level, [0.5], 'localhost', 8000)
+    """
+    if platform != 'win32' and sock.family == socket.AF_UNIX:
+        address = ip_address
+    else:
+        address = (ip_address, port)
+
+    message, stats = prepared.format(values)
+    sock.sendto(message, address)
+    if safer:
+        sleep(10e-9)
+
+    return stats
+
+
 def send_bundle(
     messages, ip_address, port, timetag=None, sock=None, safer=False,
     encoding='', encoding_errors='strict'
@@ -141,6 +168,15 @@ class OSCClient(object):
         self.stats += stats
         return stats
 
+    def send_prepared(self, prepared, values, safer=False):
+        """Wrap the module level `send_prepared` function."""
+        stats = send_prepared(
+            prepared, values, self.address, self.port, self.sock,
+            safer=safer
+        )
+        self.stats += stats
+        return stats
+
     def send_bundle(self, messages, timetag=None, safer=False):
         """Wrap the module level `send_bundle` function."""
         stats = send_bundle(
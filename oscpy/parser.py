@@ -3,18 +3,38 @@
 types are automatically inferred using the `PARSERS` and `WRITERS` members.
 
 Allowed types are:
-    int (but not *long* ints) -> osc int
+    int -> osc int, or osc int64 if it doesn't fit in 32 bits
+    Int64 -> osc int64
     floats -> osc float
+    Double -> osc double
     bytes (encoded strings) -> osc strings
     bytearray (raw data) -> osc blob
+    None -> osc nil
+    MidiTuple -> osc midi message
+    RGBATuple -> osc color
+    list and tuple -> osc array, containing any allowed type
+    1-D numpy arrays of float32, int32, float64 or int64 -> as many osc
+        floats, ints, doubles or int64
+
+Messages are packed using a `struct.Struct` compiled for their signature
+(address length, types and sizes of the values), these are kept in
+`ENCODER_CACHE`, so formatting messages of a known shape doesn't need to
+infer types or build a format again.
+Similarly, reading messages uses decoding steps compiled for their tag
+string, kept in `DECODER_CACHE`, so runs of fixed width values (ints,
+floats, timetags) are unpacked with a single call.
 
 """
 
 __all__ = (
     'parse',
-    'read_packet', 'read_message', 'read_bundle',
+    'read_packet', 'read_message', 'read_bundle', 'decode_values',
+    'iter_packet', 'iter_bundle',
+    'read_header', 'LazyMessage',
     'format_bundle', 'format_message',
-    'MidiTuple',
+    'format_bundle_into', 'format_message_into', 'PreparedMessage',
+    'MidiTuple', 'RGBATuple', 'Double', 'Int64',
+    'ENCODER_CACHE', 'DECODER_CACHE',
 )
 
 
@@ -22,7 +42,14 @@ from struct import Struct, pack, unpack_from, calcsize
 from time import time
 import sys
 from collections import Counter, namedtuple
+from functools import partial
 from oscpy.stats import Stats
+from oscpy.cache import LRUCache
+
+try:
+    import numpy
+except ImportError:  # pragma: no cover
+    numpy = None
 
 if sys.version_info.major > 2:  # pragma: no cover
     UNICODE = str
@@ -32,9 +59,14 @@ else:  # pragma: no cover
     from itertools import izip
 
 INT = Struct('>i')
+LONG = Struct('>q')
 FLOAT = Struct('>f')
+DOUBLE = Struct('>d')
+CHAR = Struct('>3xc')
+RGBA = Struct('>4B')
 STRING = Struct('>s')
 TIME_TAG = Struct('>II')
+BUNDLE_HEADER = Struct('>8sII')
 
 TP_PACKET_FORMAT = "!12I"
 # 1970-01-01 00:00:00
@@ -45,6 +77,20 @@ EMPTY = tuple()
 INF = float('inf')
 
 MidiTuple = namedtuple('MidiTuple', 'port_id status_byte data1 data2')
+RGBATuple = namedtuple('RGBATuple', 'red green blue alpha')
+
+INT32_MIN, INT32_MAX = -2 ** 31, 2 ** 31 - 1
+
+
+class Double(float):
+    """A float to be sent as an osc double (64 bits) instead of a float."""
+
+
+class Int64(int):
+    """An int to be sent as an osc int64, even if it fits in 32 bits.
+
+    Ints outside of the 32 bits range are automatically sent as int64.
+    """
 
 def padded(l, n=4):
     """Return the size to pad a thing to.
@@ -65,36 +111,72 @@ def parse_float(value, offset=0, **kwargs):
     return FLOAT.unpack_from(value, offset)[0], FLOAT.size
 
 
-def parse_string(value, offset=0, encoding='', encoding_errors='strict'):
+def parse_string(
+    value, offset=0, encoding='', encoding_errors='strict', **kwargs
+):
     """Return a string from offset in value.
 
     If encoding is defined, the string will be decoded. `encoding_errors`
     will be used to manage encoding errors in decoding.
     """
-    result = []
-    count = 0
-    ss = STRING.size
-    while True:
-        c = STRING.unpack_from(value, offset + count)[0]
-        count += ss
-
-        if c == NULL:
-            break
-        result.append(c)
+    end = value.find(NULL, offset)
+    if end < 0:
+        raise ValueError(
+            "string at offset {} is not null terminated".format(offset))
 
-    r = b''.join(result)
+    r = value[offset:end]
+    count = end - offset + 1
     if encoding:
         return r.decode(encoding, errors=encoding_errors), padded(count)
     else:
         return r, padded(count)
 
 
-def parse_blob(value, offset=0, **kwargs):
-    """Return a blob from offset in value."""
+def parse_blob(value, offset=0, zero_copy=False, **kwargs):
+    """Return a blob from offset in value.
+
+    If `zero_copy` is True, the blob is returned as a `memoryview` on
+    `value` instead of a copy of its data.
+    """
     size = INT.size
     length = INT.unpack_from(value, offset)[0]
-    data = unpack_from('>%is' % length, value, offset + size)[0]
-    return data, padded(length)
+    start = offset + size
+    end = start + length
+    if length < 0 or end > len(value):
+        raise ValueError(
+            "blob at offset {} is truncated, expected {} bytes".format(
+                offset, length))
+
+    if zero_copy:
+        data = memoryview(value)[start:end]
+    else:
+        data = value[start:end]
+    return data, size + padded(length)
+
+
+def parse_long(value, offset=0, **kwargs):
+    """Return an int64 from offset in value."""
+    return LONG.unpack_from(value, offset)[0], LONG.size
+
+
+def parse_double(value, offset=0, **kwargs):
+    """Return a double from offset in value."""
+    return DOUBLE.unpack_from(value, offset)[0], DOUBLE.size
+
+
+def parse_char(
+    value, offset=0, encoding='', encoding_errors='strict', **kwargs
+):
+    """Return a 1 char string from the 32 bits at offset in value."""
+    c = CHAR.unpack_from(value, offset)[0]
+    if encoding:
+        return c.decode(encoding, errors=encoding_errors), CHAR.size
+    return c, CHAR.size
+
+
+def parse_rgba(value, offset=0, **kwargs):
+    """Return a RGBATuple from offset in value."""
+    return RGBATuple(*RGBA.unpack_from(value, offset)), RGBA.size
 
 
 def parse_midi(value, offset=0, **kwargs):
@@ -117,6 +199,20 @@ def format_midi(value):
     return sum((val & 0xFF) << 8 * (3 - pos) for pos, val in enumerate(value))
 
 
+# colors are packed the same way midi messages are, 4 bytes in an int
+format_rgba = format_midi
+
+
+def format_blob(value):
+    """Return the size and data struct arguments of a blob."""
+    return len(value), value
+
+
+def format_array(value, dtype):
+    """Return the data of a numpy array, converted to big endian `dtype`."""
+    return (value.astype(dtype, copy=False).tobytes(), )
+
+
 def parse_true(*args, **kwargs):
     return True, 0
 
@@ -161,14 +257,12 @@ PARSERS = {
     b'N': parse_nil,
     b'I': parse_infinitum,
     b't': parse_timeage,
-    # TODO
-    # b'h': parse_long,
-    # b't': parse_timetage,
-    # b'd': parse_double,
-    # b'c': parse_char,
-    # b'r': parse_rgba,
-    # b'[': parse_array_start,
-    # b']': parse_array_end,
+    b'h': parse_long,
+    b'd': parse_double,
+    b'c': parse_char,
+    b'r': parse_rgba,
+    # arrays ('[' and ']') are not values, they are managed by
+    # `decode_values`.
 }
 
 
@@ -179,23 +273,120 @@ PARSERS.update({
 
 
 WRITERS = (
+    (Double, (b'd', b'd')),
     (float, (b'f', b'f')),
+    (Int64, (b'h', b'q')),
     (int, (b'i', b'i')),
     (bytes, (b's', b'%is')),
     (UNICODE, (b's', b'%is')),
-    (bytearray, (b'b', b'%ib')),
+    (bytearray, (b'b', b'i%is')),
     (True, (b'T', b'')),
     (False, (b'F', b'')),
     (None, (b'N', b'')),
     (MidiTuple, (b'm', b'I')),
+    (RGBATuple, (b'r', b'I')),
 )
 
+# writer of ints too big to be sent as osc ints
+LONG_WRITER = (b'h', b'q')
+
+# classes of values sent as osc arrays, and the tags delimiting them
+ARRAYS = (list, tuple)
+ARRAY_START, ARRAY_END = b'[', b']'
+
+
+# tags whose values can be unpacked together, with their struct format
+FIXED_FORMATS = {
+    b'i': b'i',
+    b'f': b'f',
+    b't': b'Q',
+    b'h': b'q',
+    b'd': b'd',
+}
+
+# tags without data
+CONSTANTS = {
+    b'T': True,
+    b'F': False,
+    b'N': None,
+    b'I': INF,
+}
+
+(
+    DECODE_RUN, DECODE_CONSTANT, DECODE_PARSE, DECODE_ARRAY,
+    DECODE_OPEN, DECODE_CLOSE
+) = ('run', 'constant', 'parse', 'array', 'open', 'close')
+
+# maps tag strings to the steps needed to decode their values
+DECODER_CACHE = LRUCache(maxsize=256)
 
 PADSIZES = {
     bytes: 4,
-    bytearray: 8
+    bytearray: 4
 }
 
+# values whose size is part of the message signature
+SIZED = (bytes, bytearray)
+
+
+def format_char(value):
+    """Return the struct arguments of a 1 char string."""
+    if isinstance(value, UNICODE):
+        value = value.encode('ascii')
+    return (value, )
+
+
+# functions returning the struct arguments for values that can't be
+# packed directly
+CONVERTERS = {
+    b'c': format_char,
+    b'b': format_blob,
+    b'm': lambda value: (format_midi(value), ),
+    b'r': lambda value: (format_rgba(value), ),
+    b'T': format_true,
+    b'F': format_false,
+    b'N': format_nil,
+    b'I': format_infinitum,
+}
+
+# numpy arrays, and the tags and big endian dtypes used for their values,
+# by (dtype kind, itemsize)
+NDARRAY = numpy.ndarray if numpy is not None else None
+ARRAY_WRITERS = {
+    ('f', 4): (b'f', '>f4'),
+    ('i', 4): (b'i', '>i4'),
+    ('f', 8): (b'd', '>f8'),
+    ('i', 8): (b'h', '>i8'),
+}
+
+# dtypes of the runs of values decoded as numpy arrays
+ARRAY_DTYPES = {
+    b'f': '>f4',
+    b'i': '>i4',
+    b'd': '>f8',
+    b'h': '>i8',
+}
+
+# struct formats of the tags that can be used in a `PreparedMessage`
+PREPARED_FORMATS = dict(FIXED_FORMATS)
+PREPARED_FORMATS.update({
+    b'c': b'3xc',
+    b'm': b'I',
+    b'r': b'I',
+    b'T': b'',
+    b'F': b'',
+    b'N': b'',
+    b'I': b'',
+})
+
+MessageEncoder = namedtuple(
+    'MessageEncoder', 'struct tags converters types params'
+)
+
+# maps message signatures to compiled `MessageEncoder` instances,
+# `ENCODER_CACHE.info()` reports its hits and misses.
+ENCODER_CACHE = LRUCache(maxsize=256)
+
 
 def parse(hint, value, offset=0, encoding='', encoding_errors='strict'):
     """Call the correct parser function for the provided hint.
@@ -216,111 +407,576 @@ def parse(hint, value, offset=0, encoding='', encoding_errors='strict'):
     )
 
 
-def format_message(address, values, encoding='', encoding_errors='strict'):
-    """Create a message."""
-    tags = [b',']
-    fmt = []
-
-    encode_cache = {}
+def _find_writer(value):
+    """Return the (class or value, writer) entry of `WRITERS` for value."""
+    for cls_or_value, writer in WRITERS:
+        if (
+            cls_or_value is value
+            or isinstance(cls_or_value, type)
+            and isinstance(value, cls_or_value)
+        ):
+            return cls_or_value, writer
 
-    lv = 0
-    count = Counter()
+    raise TypeError(
+        u'unable to find a writer for value {}, type not in: {}.'
+        .format(value, [x[0] for x in WRITERS])
+    )
 
-    for value in values:
-        lv += 1
-        cls_or_value, writer = None, None
-        for cls_or_value, writer in WRITERS:
-            if (
-                cls_or_value is value
-                or isinstance(cls_or_value, type)
-                and isinstance(value, cls_or_value)
-            ):
-                break
-        else:
-            raise TypeError(
-                u'unable to find a writer for value {}, type not in: {}.'
-                .format(value, [x[0] for x in WRITERS])
-            )
 
-        if cls_or_value == UNICODE:
-            if not encoding:
-                raise TypeError(u"Can't format unicode string without encoding")
+def _find_array_writer(value):
+    """Return the tag and big endian dtype to encode a numpy array."""
+    dtype = value.dtype
+    writer = ARRAY_WRITERS.get((dtype.kind, dtype.itemsize))
+    if writer is None or value.ndim != 1:
+        raise TypeError(
+            u'unable to format numpy array of dtype {} and shape {}, only '
+            u'1-D arrays of {} are supported.'
+            .format(dtype, value.shape, sorted(ARRAY_WRITERS))
+        )
+    return writer
 
-            cls_or_value = bytes
-            value = (
-                encode_cache[value]
-                if value in encode_cache else
-                encode_cache.setdefault(
-                    value, value.encode(encoding, errors=encoding_errors)
-                )
-            )
 
-        assert cls_or_value, writer
+def _compile_encoder(signature, values):
+    """Build a `MessageEncoder` for a message signature.
 
-        tag, v_fmt = writer
-        if b'%i' in v_fmt:
+    `signature` is the cache key computed by `_prepare_message`, its
+    first item is the length of the address, the rest describes the
+    values, and contains `ARRAY_START` and `ARRAY_END` around arrays.
+    `values` is a flattened sample of values matching it, used to infer
+    the osc types.
+    """
+    tags = [b',']
+    fmt = []
+    converters = []
+    types = Counter()
+    values = iter(values)
+
+    for item in signature[1:]:
+        if item is ARRAY_START or item is ARRAY_END:
+            tags.append(item)
+            continue
+
+        value = next(values)
+        if NDARRAY is not None and isinstance(value, NDARRAY):
+            tag, dtype = _find_array_writer(value)
+            count = len(value)
+            tags.append(tag * count)
+            fmt.append(b'%is' % (count * value.dtype.itemsize))
+            converters.append(partial(format_array, dtype=dtype))
+            types[tag.decode('utf8')] += count
+            continue
+
+        cls_or_value, (tag, v_fmt) = _find_writer(value)
+
+        if cls_or_value is bytearray:
+            # blobs are not null terminated
+            v_fmt = v_fmt % padded(len(value), PADSIZES[cls_or_value])
+        elif b'%i' in v_fmt:
             v_fmt = v_fmt % padded(len(value) + 1, PADSIZES[cls_or_value])
+        elif item is LONG_WRITER:
+            tag, v_fmt = LONG_WRITER
 
         tags.append(tag)
         fmt.append(v_fmt)
-        count[tag.decode('utf8')] += 1
+        converters.append(CONVERTERS.get(tag))
+        types[tag.decode('utf8')] += 1
 
-    fmt = b''.join(fmt)
     tags = b''.join(tags + [NULL])
+    struct = Struct(
+        b'>%is%is%s' % (padded(signature[0]), padded(len(tags)), b''.join(fmt))
+    )
+    return MessageEncoder(
+        struct, tags, tuple(converters) if any(converters) else None,
+        types, sum(types.values())
+    )
+
+
+def _flatten_values(values, signature, encoded, encoding, encoding_errors):
+    """Append the signature and encoded values of `values`.
 
+    Strings are encoded, arrays are flattened, with `ARRAY_START` and
+    `ARRAY_END` around their content in `signature`.
+    """
+    for value in values:
+        # most common types are checked first, by class
+        cls = value.__class__
+        if cls is float:
+            signature.append(float)
+        elif cls is int:
+            if INT32_MIN <= value <= INT32_MAX:
+                signature.append(int)
+            else:
+                signature.append(LONG_WRITER)
+        elif cls is bytes:
+            signature.append((bytes, len(value)))
+        elif cls in ARRAYS:
+            signature.append(ARRAY_START)
+            _flatten_values(
+                value, signature, encoded, encoding, encoding_errors
+            )
+            signature.append(ARRAY_END)
+            continue
+        else:
+            if isinstance(value, UNICODE):
+                if not encoding:
+                    raise TypeError(
+                        u"Can't format unicode string without encoding")
+                value = value.encode(encoding, errors=encoding_errors)
+
+            if isinstance(value, SIZED):
+                signature.append((value.__class__, len(value)))
+            elif NDARRAY is not None and isinstance(value, NDARRAY):
+                # subclasses (memmap...) need their shape in the key too
+                signature.append((NDARRAY, value.dtype.str, value.shape))
+            else:
+                signature.append(cls)
+        encoded.append(value)
+
+
+def _prepare_message(address, values, encoding, encoding_errors):
+    """Return the encoder and the arguments to pack a message with.
+
+    Strings are encoded, and the type signature of the values is
+    computed, to get a `MessageEncoder` from `ENCODER_CACHE`, or compile
+    and store a new one.
+    """
     if encoding and isinstance(address, UNICODE):
         address = address.encode(encoding, errors=encoding_errors)
 
     if not address.endswith(NULL):
         address += NULL
 
-    fmt = b'>%is%is%s' % (padded(len(address)), padded(len(tags)), fmt)
-    message = pack(
-        fmt,
-        address,
-        tags,
-        *(
-            (
-                encode_cache.get(v) + NULL if isinstance(v, UNICODE) and encoding
-                else (v + NULL) if t in (b's', b'b')
-                else format_midi(v) if isinstance(v, MidiTuple)
-                else v
-            )
-            for t, v in
-            izip(tags[1:], values)
+    signature = [len(address)]
+    encoded = []
+    _flatten_values(values, signature, encoded, encoding, encoding_errors)
+
+    signature = tuple(signature)
+    encoder = ENCODER_CACHE.get(signature)
+    if encoder is None:
+        encoder = _compile_encoder(signature, encoded)
+        ENCODER_CACHE[signature] = encoder
+
+    args = [address, encoder.tags]
+    converters = encoder.converters
+    if converters is None:
+        args.extend(encoded)
+    else:
+        for convert, value in izip(converters, encoded):
+            if convert is None:
+                args.append(value)
+            else:
+                args.extend(convert(value))
+
+    return encoder, args
+
+
+def _check_space(buffer, offset, size):
+    """Raise a ValueError if `size` bytes don't fit in buffer at offset."""
+    if offset < 0 or offset + size > len(buffer):
+        raise ValueError(
+            "buffer of size {} is too small to write {} bytes at offset {}"
+            .format(len(buffer), size, offset)
         )
+
+
+def format_message(address, values, encoding='', encoding_errors='strict'):
+    """Create a message."""
+    encoder, args = _prepare_message(
+        address, values, encoding, encoding_errors)
+    message = encoder.struct.pack(*args)
+    return message, Stats(
+        1, len(message), encoder.params, Counter(encoder.types)
     )
-    return message, Stats(1, len(message), lv, count)
 
 
-def read_message(data, offset=0, encoding='', encoding_errors='strict', validate_message_address=True):
-    """Return address, tags, values, and length of a decoded message.
+def format_message_into(
+    buffer, address, values, offset=0, encoding='', encoding_errors='strict'
+):
+    """Write a message into `buffer`, starting at `offset`.
 
-    Can be called either on a standalone message, or on a message
-    extracted from a bundle.
+    `buffer` can be any writable buffer, like a `bytearray` or a
+    `memoryview` on one. See `format_message` for the other parameters.
+
+    Returns the number of bytes written and the stats of the message,
+    nothing is written and a ValueError is raised if the message doesn't
+    fit in the buffer.
     """
+    encoder, args = _prepare_message(
+        address, values, encoding, encoding_errors)
+    size = encoder.struct.size
+    _check_space(buffer, offset, size)
+    encoder.struct.pack_into(buffer, offset, *args)
+    return size, Stats(1, size, encoder.params, Counter(encoder.types))
+
+
+class PreparedMessage(object):
+    """A message with a fixed address and type tags, to send repeatedly.
+
+    The address and tag string are encoded and padded once, and the
+    values are packed with a `Struct` compiled for `typetags`, so
+    formatting the message only has to pack the values.
+
+    Only fixed size types can be used (see `PREPARED_FORMATS`), one
+    value must be given for each tag, the values of T, F, N and I tags
+    are ignored.
+
+    example:
+        level = PreparedMessage(b'/mixer/ch/12/level', b'f')
+        message, stats = level.format([0.5])
+    """
+
+    def __init__(
+        self, address, typetags, encoding='', encoding_errors='strict'
+    ):
+        if encoding and isinstance(address, UNICODE):
+            address = address.encode(encoding, errors=encoding_errors)
+        if isinstance(typetags, UNICODE):
+            typetags = typetags.encode('ascii')
+        if typetags.startswith(b','):
+            typetags = typetags[1:]
+
+        fmt = []
+        converters = []
+        types = Counter()
+        for i in range(len(typetags)):
+            tag = typetags[i:i + 1]
+            if tag not in PREPARED_FORMATS:
+                raise ValueError(
+                    "type tag {} can't be used in a PreparedMessage, only "
+                    "fixed size types are supported".format(tag)
+                )
+            fmt.append(PREPARED_FORMATS[tag])
+            converters.append(CONVERTERS.get(tag))
+            types[tag.decode('utf8')] += 1
+
+        if not address.endswith(NULL):
+            address += NULL
+        tags = b',' + typetags + NULL
+        prefix = pack(
+            b'>%is%is' % (padded(len(address)), padded(len(tags))),
+            address, tags
+        )
+
+        self.address = address.rstrip(NULL)
+        self.typetags = typetags
+        self.struct = Struct(b'>%is%s' % (len(prefix), b''.join(fmt)))
+        self.size = self.struct.size
+        self._prefix = prefix
+        self._converters = tuple(converters) if any(converters) else None
+        self._types = types
+
+    def _args(self, values):
+        if len(values) != len(self.typetags):
+            raise ValueError(
+                "{} values given for type tags {}".format(
+                    len(values), self.typetags)
+            )
+
+        converters = self._converters
+        if converters is None:
+            return values
+
+        args = []
+        for convert, value in izip(converters, values):
+            if convert is None:
+                args.append(value)
+            else:
+                args.extend(convert(value))
+        return args
+
+    def _stats(self):
+        return Stats(1, self.size, len(self.typetags), Counter(self._types))
+
+    def format(self, values):
+        """Return the message with `values`, and its stats."""
+        return (
+            self.struct.pack(self._prefix, *self._args(values)),
+            self._stats()
+        )
+
+    def format_into(self, buffer, values, offset=0):
+        """Write the message with `values` into buffer at offset.
+
+        See `format_message_into` for the returned value.
+        """
+        args = self._args(values)
+        _check_space(buffer, offset, self.size)
+        self.struct.pack_into(buffer, offset, self._prefix, *args)
+        return self.size, self._stats()
+
+    def __repr__(self):
+        return 'PreparedMessage({!r}, {!r})'.format(
+            self.address, self.typetags
+        )
+
+
+def _compile_decoder(tags, numpy_arrays=False):
+    """Build the list of steps needed to decode values of type `tags`.
+
+    Consecutive fixed width values are grouped in a single `Struct`,
+    each other value is either a constant or decoded by its parser, and
+    arrays are opened and closed by their own steps.
+
+    If `numpy_arrays` is True, runs of at least two ints or floats are
+    decoded as a single numpy array instead.
+    """
+    if numpy_arrays and numpy is None:
+        raise ImportError('numpy is required to decode numpy arrays')
+
+    steps = []
+    run = []
+
+    def flush_run():
+        if run:
+            steps.append((DECODE_RUN, Struct(b'>' + b''.join(run))))
+            del run[:]
+
+    i = 0
+    depth = 0
+    length = len(tags)
+    while i < length:
+        tag = tags[i:i + 1]
+        i += 1
+
+        if numpy_arrays and tag in ARRAY_DTYPES:
+            count = 1
+            while tags[i:i + 1] == tag:
+                count += 1
+                i += 1
+
+            if count > 1:
+                flush_run()
+                steps.append(
+                    (DECODE_ARRAY, (numpy.dtype(ARRAY_DTYPES[tag]), count))
+                )
+            else:
+                run.append(FIXED_FORMATS[tag])
+            continue
+
+        if tag in FIXED_FORMATS:
+            run.append(FIXED_FORMATS[tag])
+            continue
+
+        flush_run()
+
+        if tag == ARRAY_START:
+            depth += 1
+            steps.append((DECODE_OPEN, None))
+        elif tag == ARRAY_END:
+            depth -= 1
+            if depth < 0:
+                raise ValueError("unexpected end of array in {}".format(tags))
+            steps.append((DECODE_CLOSE, None))
+        elif tag in CONSTANTS:
+            steps.append((DECODE_CONSTANT, CONSTANTS[tag]))
+        elif tag in PARSERS:
+            steps.append((DECODE_PARSE, PARSERS[tag]))
+        else:
+            raise ValueError(
+                "no known parser for type hint: {}".format(tag)
+            )
+
+    flush_run()
+    if depth:
+        raise ValueError("unterminated array in {}".format(tags))
+    return tuple(steps)
+
+
+def _as_bytes(data):
+    """(internal) Copy a buffer (memoryview, mmap...) to bytes.
+
+    The parsing functions need the `find` method of bytes, the entry
+    points of the parser call this on data of other types.
+    """
+    return memoryview(data).tobytes()
+
+
+def decode_values(
+    tags, data, offset=0, encoding='', encoding_errors='strict',
+    zero_copy=False, numpy_arrays=False
+):
+    """Return the values described by `tags` and their size in data.
+
+    The decoding steps for a tag string are kept in `DECODER_CACHE`.
+    See `parse_blob` for the `zero_copy` parameter. Osc arrays are
+    returned as (nested) lists.
+
+    If `numpy_arrays` is True, runs of at least two values of the same
+    type, among ints and floats, are returned as a single read-only numpy
+    array viewing `data`, with a big endian dtype.
+    """
+    if not isinstance(data, (bytes, bytearray)):
+        data = _as_bytes(data)
+    key = (tags, True) if numpy_arrays else tags
+    plan = DECODER_CACHE.get(key)
+    if plan is None:
+        plan = _compile_decoder(tags, numpy_arrays=numpy_arrays)
+        DECODER_CACHE[key] = plan
+
+    result = values = []
+    parents = []
+    index = offset
+    for kind, step in plan:
+        if kind is DECODE_RUN:
+            values.extend(step.unpack_from(data, index))
+            index += step.size
+        elif kind is DECODE_PARSE:
+            value, size = step(
+                data, offset=index, encoding=encoding,
+                encoding_errors=encoding_errors, zero_copy=zero_copy
+            )
+            values.append(value)
+            index += size
+        elif kind is DECODE_CONSTANT:
+            values.append(step)
+        elif kind is DECODE_ARRAY:
+            dtype, count = step
+            values.append(numpy.frombuffer(data, dtype, count, index))
+            index += dtype.itemsize * count
+        elif kind is DECODE_OPEN:
+            array = []
+            values.append(array)
+            parents.append(values)
+            values = array
+        else:
+            values = parents.pop()
+
+    return result, index - offset
+
+
+def read_address(data, offset=0, validate_message_address=True):
+    """Return the address of a message and the offset of its tags."""
     address, size = parse_string(data, offset=offset)
-    index = size
     if not address.startswith(b'/') and validate_message_address:
         raise ValueError("address {} doesn't start with a '/'".format(address))
+    return address, offset + size
+
 
-    tags, size = parse_string(data, offset=offset + index)
+def read_tags(data, offset=0):
+    """Return the tags of a message and the offset of its values."""
+    tags, size = parse_string(data, offset=offset)
     if not tags.startswith(b','):
         raise ValueError("tag string {} doesn't start with a ','".format(tags))
-    tags = tags[1:]
+    return tags[1:], offset + size
+
+
+def read_header(data, offset=0, validate_message_address=True):
+    """Return the address, tags and offset of the values of a message."""
+    address, index = read_address(
+        data, offset, validate_message_address=validate_message_address
+    )
+    tags, index = read_tags(data, index)
+    return address, tags, index
 
-    index += size
 
-    values = []
-    for tag in tags:
-        value, off = parse(
-            tag, data, offset=offset + index, encoding=encoding,
-            encoding_errors=encoding_errors
+class LazyMessage(object):
+    """A message whose tags and values are only decoded when accessed.
+
+    The address is read when the message is created, so it can be used
+    to decide if the message is of any interest, `tags` and `values`
+    are decoded from `data` the first time they are read, so messages
+    nobody is interested in don't pay for their decoding.
+
+    `offset` is the position of the message in `data`, and `size` its
+    length, which defaults to the rest of `data`.
+
+    Iterating on a `LazyMessage` gives the same (address, tags, values,
+    end offset) tuple a non lazy read would give.
+    """
+
+    __slots__ = (
+        'address', 'data', 'offset', 'size', 'encoding', 'encoding_errors',
+        'zero_copy', 'numpy_arrays', '_tags_offset', '_tags',
+        '_values_offset', '_values'
+    )
+
+    def __init__(
+        self, data, offset=0, size=None, encoding='', encoding_errors='strict',
+        validate_message_address=True, zero_copy=False, numpy_arrays=False
+    ):
+        if not isinstance(data, (bytes, bytearray)):
+            data = _as_bytes(data)
+        self.address, self._tags_offset = read_address(
+            data, offset, validate_message_address=validate_message_address
+        )
+        self.data = data
+        self.offset = offset
+        self.size = len(data) - offset if size is None else size
+        self.encoding = encoding
+        self.encoding_errors = encoding_errors
+        self.zero_copy = zero_copy
+        self.numpy_arrays = numpy_arrays
+        self._tags = None
+        self._values = None
+
+    @property
+    def tags(self):
+        """The type tags of the message, without the leading ','."""
+        if self._tags is None:
+            self._tags, self._values_offset = read_tags(
+                self.data, self._tags_offset
+            )
+        return self._tags
+
+    @property
+    def values(self):
+        """The decoded values of the message."""
+        if self._values is None:
+            tags = self.tags
+            self._values = decode_values(
+                tags, self.data, self._values_offset,
+                encoding=self.encoding, encoding_errors=self.encoding_errors,
+                zero_copy=self.zero_copy, numpy_arrays=self.numpy_arrays
+            )[0]
+        return self._values
+
+    def __iter__(self):
+        return iter(
+            (self.address, self.tags, self.values, self.offset + self.size)
         )
-        values.append(value)
-        index += off
 
-    return address, tags, values, index
+    def __repr__(self):
+        return 'LazyMessage({!r})'.format(self.address)
+
+
+def read_message(
+    data, offset=0, encoding='', encoding_errors='strict',
+    validate_message_address=True, zero_copy=False, lazy=False,
+    numpy_arrays=False
+):
+    """Return address, tags, values, and length of a decoded message.
+
+    Can be called either on a standalone message, or on a message
+    extracted from a bundle.
+
+    If `zero_copy` is True, blobs are returned as `memoryview` slices of
+    `data` instead of copies.
+
+    If `lazy` is True, a `LazyMessage` is returned instead, its values
+    will only be decoded if they are accessed.
+
+    If `numpy_arrays` is True, runs of ints or floats are returned as
+    numpy arrays, see `decode_values`.
+    """
+    if not isinstance(data, (bytes, bytearray)):
+        data = _as_bytes(data)
+    if lazy:
+        return LazyMessage(
+            data, offset, encoding=encoding, encoding_errors=encoding_errors,
+            validate_message_address=validate_message_address,
+            zero_copy=zero_copy, numpy_arrays=numpy_arrays
+        )
+
+    address, tags, index = read_header(
+        data, offset, validate_message_address=validate_message_address
+    )
+
+    values, size = decode_values(
+        tags, data, index, encoding=encoding,
+        encoding_errors=encoding_errors, zero_copy=zero_copy,
+        numpy_arrays=numpy_arrays
+    )
+    return address, tags, values, index - offset + size
 
 
 def time_to_timetag(value):
@@ -351,6 +1007,37 @@ def timetag_to_time(timetag):
     return seconds + fract / 2. ** 32 - NTP_DELTA
 
 
+def _prepare_bundle(data, encoding, encoding_errors):
+    """Return the size, stats and prepared messages of a bundle."""
+    messages = []
+    stats = Stats()
+    size = BUNDLE_HEADER.size
+    for address, values in data:
+        encoder, args = _prepare_message(
+            address, values, encoding, encoding_errors
+        )
+        messages.append((encoder, args))
+        size += INT.size + encoder.struct.size
+        stats += Stats(
+            1, encoder.struct.size, encoder.params, encoder.types
+        )
+    return size, stats, messages
+
+
+def _pack_bundle_into(buffer, offset, timetag, messages):
+    """Write the header and prepared messages of a bundle into buffer."""
+    BUNDLE_HEADER.pack_into(
+        buffer, offset, b'#bundle\0', *time_to_timetag(timetag)
+    )
+    offset += BUNDLE_HEADER.size
+
+    for encoder, args in messages:
+        struct = encoder.struct
+        INT.pack_into(buffer, offset, struct.size)
+        struct.pack_into(buffer, offset + INT.size, *args)
+        offset += INT.size + struct.size
+
+
 def format_bundle(data, timetag=None, encoding='', encoding_errors='strict'):
     """Create a bundle from a list of (address, values) tuples.
 
@@ -358,77 +1045,193 @@ def format_bundle(data, timetag=None, encoding='', encoding_errors='strict'):
     as bytes.
     `encoding_errors` will be used to manage encoding errors.
     """
-    timetag = time_to_timetag(timetag)
-    bundle = [pack('8s', b'#bundle\0')]
-    bundle.append(TIME_TAG.pack(*timetag))
+    size, stats, messages = _prepare_bundle(data, encoding, encoding_errors)
+    bundle = bytearray(size)
+    _pack_bundle_into(bundle, 0, timetag, messages)
+    return bytes(bundle), stats
 
-    stats = Stats()
-    for address, values in data:
-        msg, st = format_message(
-            address, values, encoding='',
-            encoding_errors=encoding_errors
-        )
-        bundle.append(pack('>i', len(msg)))
-        bundle.append(msg)
-        stats += st
 
-    return b''.join(bundle), stats
+def format_bundle_into(
+    buffer, data, offset=0, timetag=None, encoding='',
+    encoding_errors='strict'
+):
+    """Write a bundle into `buffer`, starting at `offset`.
+
+    See `format_message_into` for `buffer` and the returned value, and
+    `format_bundle` for the other parameters.
+    """
+    size, stats, messages = _prepare_bundle(data, encoding, encoding_errors)
+    _check_space(buffer, offset, size)
+    _pack_bundle_into(buffer, offset, timetag, messages)
+    return size, stats
 
 
-def read_bundle(data, encoding='', encoding_errors='strict'):
-    """Decode a bundle into a (timestamp, messages) tuple."""
-    length = len(data)
+def _read_bundle_timetag(data, offset, end):
+    """(internal) Check the header of a bundle, and return its timetag.
 
-    header = unpack_from('7s', data, 0)[0]
-    offset = 8 * STRING.size
-    if header != b'#bundle':
+    The timetag is None if the bundle must be processed immediately.
+    """
+    header = data[offset:offset + 8]
+    if header != b'#bundle\0' or end - offset < BUNDLE_HEADER.size:
         raise ValueError(
             "the message doesn't start with '#bundle': {}".format(header))
 
-    timetag = timetag_to_time(TIME_TAG.unpack_from(data, offset))
-    offset += TIME_TAG.size
+    header, seconds, fract = BUNDLE_HEADER.unpack_from(data, offset)
+    return None if (seconds, fract) == (0, 1) else timetag_to_time(
+        (seconds, fract)
+    )
 
-    messages = []
-    while offset < length:
-        # NOTE, we don't really care about the size of the message, our
-        # parsing will compute it anyway
-        # size = Int.unpack_from(data, offset)
+
+def iter_bundle(
+    data, offset=0, size=None, encoding='', encoding_errors='strict',
+    zero_copy=False, lazy=False, numpy_arrays=False,
+    validate_message_address=True
+):
+    """Iterate on the messages of a bundle, as they are decoded.
+
+    Yield a (timetag, message) tuple for each message, where timetag is
+    the time of the bundle directly containing the message, or None if
+    the bundle must be processed immediately. Nested bundles are walked
+    as they are found, using the size of each element of the bundle.
+
+    `offset` and `size` allow to read a bundle contained in `data`,
+    `size` defaults to the rest of data.
+
+    See `read_packet` for the other parameters.
+    """
+    if not isinstance(data, (bytes, bytearray)):
+        data = _as_bytes(data)
+    end = len(data) if size is None else offset + size
+    timetag = _read_bundle_timetag(data, offset, end)
+    offset += BUNDLE_HEADER.size
+    # the (timetag, end) of the bundles containing the current one, nested
+    # bundles are walked without recursion, as their depth is only
+    # limited by the size of the packet
+    parents = []
+
+    while True:
+        while offset >= end:
+            if not parents:
+                return
+            timetag, end = parents.pop()
+
+        size = INT.unpack_from(data, offset)[0]
         offset += INT.size
-        address, tags, values, off = read_message(
-            data, offset, encoding=encoding, encoding_errors=encoding_errors
-        )
-        offset += off
-        messages.append((address, tags, values, offset))
+        if size < 0 or offset + size > end:
+            raise ValueError(
+                "bundle element at offset {} is truncated".format(offset))
+
+        if data[offset:offset + 1] == b'#':
+            parents.append((timetag, end))
+            end = offset + size
+            timetag = _read_bundle_timetag(data, offset, end)
+            offset += BUNDLE_HEADER.size
+            continue
+
+        elif lazy:
+            yield timetag, LazyMessage(
+                data, offset, size, encoding=encoding,
+                encoding_errors=encoding_errors,
+                validate_message_address=validate_message_address,
+                zero_copy=zero_copy, numpy_arrays=numpy_arrays
+            )
 
+        else:
+            address, tags, values, _ = read_message(
+                data, offset, encoding=encoding,
+                encoding_errors=encoding_errors,
+                validate_message_address=validate_message_address,
+                zero_copy=zero_copy, numpy_arrays=numpy_arrays
+            )
+            yield timetag, (address, tags, values, offset + size)
+
+        offset += size
+
+
+def read_bundle(
+    data, encoding='', encoding_errors='strict', zero_copy=False, lazy=False,
+    numpy_arrays=False
+):
+    """Decode a bundle into a (timestamp, messages) tuple.
+
+    If `lazy` is True, messages are `LazyMessage` instances.
+    Messages of nested bundles are included in the list, use
+    `iter_bundle` to get their own timetags.
+    """
+    if not isinstance(data, (bytes, bytearray)):
+        data = _as_bytes(data)
+    messages = [
+        message for _, message in iter_bundle(
+            data, encoding=encoding, encoding_errors=encoding_errors,
+            zero_copy=zero_copy, lazy=lazy, numpy_arrays=numpy_arrays
+        )
+    ]
+    timetag = timetag_to_time(TIME_TAG.unpack_from(data, 8))
     return (timetag, messages)
 
 
-def read_packet(data, drop_late=False, encoding='', encoding_errors='strict', validate_message_address=True):
-    """Detect if the data received is a simple message or a bundle, read it.
+def iter_packet(
+    data, drop_late=False, encoding='', encoding_errors='strict',
+    validate_message_address=True, zero_copy=False, lazy=False,
+    numpy_arrays=False
+):
+    """Iterate on the messages of a packet, as they are decoded.
 
-    Always return a list of messages.
-    If drop_late is true, and the received data is an expired bundle,
-    then returns an empty list.
+    Yield (timetag, message) tuples, see `iter_bundle`, the timetag of a
+    message that is not part of a bundle is None.
+    If drop_late is true, messages of expired bundles are skipped.
+
+    See `read_packet` for the other parameters.
     """
-    header = unpack_from('>c', data, 0)[0]
+    if not isinstance(data, (bytes, bytearray)):
+        data = _as_bytes(data)
+    header = data[:1]
 
     if header == b'#':
-        timetag, messages = read_bundle(
-            data, encoding=encoding, encoding_errors=encoding_errors
-        )
-        if drop_late:
-            if time() > timetag:
-                return []
-        return messages
+        now = time()
+        for timetag, message in iter_bundle(
+            data, encoding=encoding, encoding_errors=encoding_errors,
+            zero_copy=zero_copy, lazy=lazy, numpy_arrays=numpy_arrays,
+            validate_message_address=validate_message_address
+        ):
+            if drop_late and timetag is not None and now > timetag:
+                continue
+            yield timetag, message
 
     elif header == b'/' or not validate_message_address:
-        return [
-            read_message(
-                data, encoding=encoding,
-                encoding_errors=encoding_errors,
-                validate_message_address=validate_message_address
-            )
-        ]
+        yield None, read_message(
+            data, encoding=encoding,
+            encoding_errors=encoding_errors,
+            validate_message_address=validate_message_address,
+            zero_copy=zero_copy, lazy=lazy, numpy_arrays=numpy_arrays
+        )
 
     else:
         raise ValueError('packet is not a message or a bundle')
+
+
+def read_packet(
+    data, drop_late=False, encoding='', encoding_errors='strict',
+    validate_message_address=True, zero_copy=False, lazy=False,
+    numpy_arrays=False
+):
+    """Detect if the data received is a simple message or a bundle, read it.
+
+    Always return a list of messages.
+    If drop_late is true, and the received data is an expired bundle,
+    then returns an empty list.
+    If zero_copy is true, blobs are returned as `memoryview` slices of
+    `data`, which avoids copying large blobs.
+    If lazy is true, messages are returned as `LazyMessage` instances,
+    only decoding their values when accessed.
+    If numpy_arrays is true, runs of ints or floats are returned as numpy
+    arrays, see `decode_values`.
+    """
+    return [
+        message for _, message in iter_packet(
+            data, drop_late=drop_late, encoding=encoding,
+            encoding_errors=encoding_errors,
+            validate_message_address=validate_message_address,
+            zero_copy=zero_copy, lazy=lazy, numpy_arrays=numpy_arrays
+        )
+    ]
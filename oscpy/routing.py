@@ -0,0 +1,224 @@
+"Address trie used to resolve advanced matching routes"
+
+import re
+from itertools import count
+
+
+# a part containing none of these characters can only match itself, an
+# address containing '//' can match any number of parts
+PATTERN_CHARS = re.compile(b'[?*\\[\\]{}]|//')
+
+
+def is_descendant_part(parts, index):
+    """Check if the part at `index` of a split address stands for '//'.
+
+    Empty parts in the middle of an address come from '//', empty first
+    and last parts are respectively the root of the address and a
+    trailing '/'.
+    """
+    return not parts[index] and 0 < index < len(parts) - 1
+
+
+class RouteNode(object):
+    """A node of a `RouteTrie`, indexing the children of an address part.
+
+    `literals` maps exact parts to their child node, `patterns` is a list
+    of (part, regex, child) for parts using wildcards, `descendant` the
+    child standing for a '//' wildcard, if any, and `routes` the
+    (order, address, callbacks list) bound to the address ending at this
+    node. `skips` is True for the nodes standing for a '//'.
+    """
+
+    __slots__ = ('literals', 'patterns', 'descendant', 'routes', 'skips')
+
+    def __init__(self, skips=False):
+        self.literals = {}
+        self.patterns = []
+        self.descendant = None
+        self.routes = []
+        self.skips = skips
+
+
+class RouteTrie(object):
+    """Index the addresses bound on a socket by their parts.
+
+    Literal parts of the bound addresses are looked up in dicts, only
+    the parts using wildcards are matched using a regex, so the cost of
+    resolving an address depends on its depth, rather than on the number
+    of bound addresses.
+
+    A '//' in a bound address matches any number of parts (including
+    none), the node following it is kept among the candidates for each
+    remaining part of the resolved address.
+
+    `compile_part` is a function converting an address part to a
+    compiled regex.
+
+    `match_pattern` does the reverse lookup, matching an address pattern
+    against literal bound addresses.
+
+    Nodes are never mutated in a way that would break a concurrent
+    `match`, so routes can be added while the server thread resolves
+    addresses.
+    """
+
+    def __init__(self, compile_part):
+        self.compile_part = compile_part
+        self._root = RouteNode()
+        self._order = count()
+        self._descendants = False
+
+    def add(self, address, callbacks, literal=False):
+        """Bind the `callbacks` list to `address`.
+
+        The list is stored by reference, so it can later be updated in
+        place. Routes are returned by `match` in the order they were
+        added.
+
+        If `literal` is True, wildcard characters in `address` are not
+        interpreted.
+        """
+        node = self._root
+        parts = address.split(b'/')
+        for index, part in enumerate(parts):
+            if not literal and is_descendant_part(parts, index):
+                child = node.descendant
+                if child is None:
+                    child = node.descendant = RouteNode(skips=True)
+                    self._descendants = True
+            elif literal or PATTERN_CHARS.search(part) is None:
+                child = node.literals.get(part)
+                if child is None:
+                    child = node.literals[part] = RouteNode()
+            else:
+                for pattern, _, child in node.patterns:
+                    if pattern == part:
+                        break
+                else:
+                    child = RouteNode()
+                    # replaced rather than appended to, not to change the
+                    # list while it's being iterated by match
+                    node.patterns = node.patterns + [
+                        (part, self.compile_part(part), child)
+                    ]
+            node = child
+
+        node.routes = node.routes + [(next(self._order), address, callbacks)]
+
+    def match(self, address):
+        """Return the routes matching `address`.
+
+        Routes are returned as (bound address, callbacks list) pairs,
+        routes with an empty callbacks list are omitted.
+        """
+        descendants = self._descendants
+        nodes = [self._root]
+        for part in address.split(b'/'):
+            children = []
+            if descendants:
+                # nodes after a '//' can skip any part
+                nodes, skipping = self._expand(nodes)
+                children.extend(skipping)
+
+            for node in nodes:
+                child = node.literals.get(part)
+                if child is not None:
+                    children.append(child)
+                for _, regex, child in node.patterns:
+                    if regex.match(part):
+                        children.append(child)
+
+            if not children:
+                return []
+            nodes = children
+
+        if descendants:
+            nodes = self._unique(nodes)
+        return self._collect(nodes)
+
+    def match_pattern(self, pattern):
+        """Return the routes with literal parts matched by `pattern`.
+
+        Routes are returned as (bound address, callbacks list) pairs,
+        routes with an empty callbacks list are omitted.
+        """
+        nodes = [self._root]
+        compile_part = self.compile_part
+        parts = pattern.split(b'/')
+        for index, part in enumerate(parts):
+            children = []
+            if is_descendant_part(parts, index):
+                # any node under the current ones, at any depth, the
+                # subtrees overlap if a '//' was already used
+                children = self._unique(self._subtrees(nodes))
+            elif PATTERN_CHARS.search(part) is None:
+                for node in nodes:
+                    child = node.literals.get(part)
+                    if child is not None:
+                        children.append(child)
+            else:
+                regex = compile_part(part)
+                for node in nodes:
+                    # copied, as a bind could add a literal concurrently
+                    for literal, child in list(node.literals.items()):
+                        if regex.match(literal):
+                            children.append(child)
+
+            if not children:
+                return []
+            nodes = children
+
+        return self._collect(nodes)
+
+    @staticmethod
+    def _unique(nodes):
+        """(internal) Return `nodes` without duplicates."""
+        seen = set()
+        result = []
+        for node in nodes:
+            if id(node) not in seen:
+                seen.add(id(node))
+                result.append(node)
+        return result
+
+    @classmethod
+    def _expand(cls, nodes):
+        """(internal) Add the nodes standing for a '//' to `nodes`.
+
+        Return all the nodes, and the ones standing for a '//'.
+        """
+        expanded = []
+        skipping = []
+        stack = list(reversed(nodes))
+        while stack:
+            node = stack.pop()
+            expanded.append(node)
+            if node.skips:
+                skipping.append(node)
+            if node.descendant is not None:
+                stack.append(node.descendant)
+        return cls._unique(expanded), cls._unique(skipping)
+
+    @staticmethod
+    def _subtrees(nodes):
+        """(internal) Return `nodes` and all their literal descendants."""
+        result = []
+        stack = list(reversed(nodes))
+        while stack:
+            node = stack.pop()
+            result.append(node)
+            stack.extend(reversed(list(node.literals.values())))
+        return result
+
+    @staticmethod
+    def _collect(nodes):
+        """(internal) Return the routes of `nodes`, oldest first."""
+        if len(nodes) == 1:
+            routes = nodes[0].routes
+        else:
+            routes = sorted(route for node in nodes for route in node.routes)
+
+        return [
+            (address, callbacks) for _, address, callbacks in routes
+            if callbacks
+        ]
@@ -1,27 +1,59 @@
 """Server API.
 
-This module currently only implements `OSCThreadServer`, a thread based server.
+This module implements `OSCThreadServer`, a thread based server, and
+`OSCServerBase`, the routing logic it shares with the asyncio server of
+`oscpy.aio`.
 """
 import logging
 from threading import Thread, Event
 
+try:
+    from queue import Queue, Full
+except ImportError:
+    from Queue import Queue, Full
+
 import os
 import re
-import inspect
+from struct import Struct
+from multiprocessing import get_context
+from collections import Counter, namedtuple
+from heapq import heappush, heappop
+from itertools import count
 from sys import platform
 from time import sleep, time
 from functools import partial
-from select import select
+from selectors import DefaultSelector, EVENT_READ
 import socket
 
 from oscpy import __version__
-from oscpy.parser import read_packet, UNICODE
+from oscpy.parser import iter_packet, read_message, UNICODE
 from oscpy.client import send_bundle, send_message
 from oscpy.stats import Stats
+from oscpy.routing import RouteTrie, PATTERN_CHARS, is_descendant_part
+from oscpy.cache import LRUCache
 
 
 logger = logging.getLogger(__name__)
 
+# reading with MSG_DONTWAIT doesn't need the sockets to be non-blocking,
+# so sending from them still blocks when their buffer is full, where
+# it's not available, the sockets are made non-blocking
+RECV_FLAGS = getattr(socket, 'MSG_DONTWAIT', 0)
+
+# not exposed by the socket module, values from the linux headers
+if platform.startswith('linux'):
+    SO_RCVBUFFORCE = getattr(socket, 'SO_RCVBUFFORCE', 33)
+    SO_RXQ_OVFL = getattr(socket, 'SO_RXQ_OVFL', 40)
+else:
+    SO_RCVBUFFORCE = getattr(socket, 'SO_RCVBUFFORCE', None)
+    SO_RXQ_OVFL = getattr(socket, 'SO_RXQ_OVFL', None)
+
+# the drops counter given as ancillary data with SO_RXQ_OVFL
+DROPS = Struct('I')
+DROPS_ANCILLARY_SIZE = (
+    socket.CMSG_SPACE(DROPS.size) if hasattr(socket, 'CMSG_SPACE') else 0
+)
+
 
 def ServerClass(cls):
     """Decorate classes with for methods implementing OSC endpoints.
@@ -45,80 +77,245 @@ def ServerClass(cls):
     return cls
 
 
-__FILE__ = inspect.getfile(ServerClass)
+MessageContext = namedtuple(
+    'MessageContext', 'sock sender address timetag packet received'
+)
+MessageContext.__doc__ = """Describe the message handled by the callbacks.
 
+- `sock` is the socket that received the message.
+- `sender` is the address of the sender, usually a (ip, port) tuple.
+- `address` is the address of the message.
+- `timetag` is the time of the bundle containing the message, or None if
+  it was not in a bundle, or in a bundle to execute immediately.
+- `packet` is the received datagram containing the message.
+- `received` is the time the datagram was read.
+"""
 
-class OSCThreadServer(object):
-    """A thread-based OSC server.
+try:
+    from contextvars import ContextVar
+except ImportError:
+    from threading import local
 
-    Listens for osc messages in a thread, and dispatches the messages
-    values to callbacks from there.
+    class ContextVar(local):
+        """(internal) Thread local fallback for python < 3.7."""
+
+        def __init__(self, name, default=None):
+            self.value = default
+
+        def get(self):
+            return self.value
+
+        def set(self, value):
+            token, self.value = self.value, value
+            return token
+
+        def reset(self, token):
+            self.value = token
+
+# the context of the message being handled by the current thread or task
+CURRENT_MESSAGE = ContextVar('oscpy_current_message', default=None)
+
+
+def _run_in_process(
+    callback, data, values, prefix, encoding, encoding_errors, numpy_arrays
+):
+    """(internal) Call `callback` in a process of the server's pool.
+
+    If `data` is given, it's a raw message, which is decoded to get the
+    values to call the callback with.
+    """
+    if data is not None:
+        address, tags, values, size = read_message(
+            data, encoding=encoding, encoding_errors=encoding_errors,
+            validate_message_address=False, numpy_arrays=numpy_arrays
+        )
+    return callback(*(prefix + tuple(values)))
+
+
+class WrappedRoute(object):
+    """Base class of the callbacks wrapped by the options of `bind`.
+
+    Compares equal to the wrapped callback, so it can be unbound using
+    that callback, and calling it calls the callback.
+    """
+
+    def __init__(self, callback):
+        self.callback = callback
+
+    def __eq__(self, other):
+        if isinstance(other, WrappedRoute):
+            other = other.callback
+        return self.callback == other
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __hash__(self):
+        return hash(self.callback)
+
+    def __call__(self, *values):
+        return self.callback(*values)
+
+
+class ProcessRoute(WrappedRoute):
+    """A callback bound with `process=True`, see `OSCThreadServer.bind`.
+
+    Calling it submits the call to the process pool of the server, the
+    result of the callback, if not None, is sent back to the sender of
+    the message at `answer_address`, if it is set.
+    """
+
+    def __init__(self, server, callback, answer_address=None):
+        super(ProcessRoute, self).__init__(callback)
+        self.server = server
+        self.answer_address = answer_address
+
+    def __call__(self, *values):
+        sock, ip_address, port = self.server.get_sender()
+        self.submit(sock, (ip_address, port), values=values)
+
+    def submit(self, sock, sender, data=None, values=(), prefix=()):
+        """Run the callback with `values`, or the values decoded from `data`.
+
+        `prefix` is prepended to the values, and `sock` and `sender`
+        are used to send the answer.
+        """
+        server = self.server
+
+        def answer(result):
+            if self.answer_address is None or result is None:
+                return
+            if not isinstance(result, (list, tuple)):
+                result = [result]
+            server.send_message(
+                self.answer_address, result, sender[0], sender[1], sock=sock)
+
+        def error(exc):
+            logger.error(
+                "Unhandled exception caught in oscpy process pool",
+                exc_info=exc
+            )
+
+        server._pool.apply_async(
+            _run_in_process,
+            (
+                self.callback, data, values, prefix, server.encoding,
+                server.encoding_errors, server.numpy_arrays
+            ),
+            callback=answer,
+            error_callback=error
+        )
+
+
+class CoalescedRoute(WrappedRoute):
+    """A callback bound with `coalesce=True`, see `OSCThreadServer.bind`.
+
+    Only marks the callback, the server keeps the latest message for
+    it.
+    """
+
+
+class ThrottledRoute(WrappedRoute):
+    """A callback bound with `max_rate`, see `OSCServerBase.bind`.
+
+    Limits the rate of the calls using a token bucket, shared by all
+    the senders, or one per sender if `per_sender` is True (for the
+    `max_senders` most recent ones). Up to `burst` calls can be made in
+    a row after a pause.
+    """
+
+    def __init__(
+        self, callback, max_rate, per_sender=False, burst=1,
+        max_senders=1024
+    ):
+        if max_rate <= 0 or burst < 1:
+            raise ValueError('max_rate must be positive, and burst at least 1')
+
+        super(ThrottledRoute, self).__init__(callback)
+        self.max_rate = max_rate
+        self.per_sender = per_sender
+        self.burst = burst
+        # sender (or None) -> (tokens, time of the last update)
+        self._buckets = LRUCache(max_senders)
+
+    def _tokens(self, sender, now):
+        """(internal) Return the bucket key and tokens of `sender` at `now`."""
+        key = sender if self.per_sender else None
+        tokens, last = self._buckets.get(key, (self.burst, now))
+        return key, min(
+            self.burst, tokens + max(now - last, 0) * self.max_rate)
+
+    def acquire(self, sender, now):
+        """Take a token to call the callback with a message from `sender`.
+
+        Return False if the rate is exceeded.
+        """
+        key, tokens = self._tokens(sender, now)
+        allowed = tokens >= 1
+        self._buckets.set(key, (tokens - 1 if allowed else tokens, now))
+        return allowed
+
+    def delay(self, sender, now):
+        """Return the number of seconds before `acquire` can succeed."""
+        _, tokens = self._tokens(sender, now)
+        return max(1 - tokens, 0) / float(self.max_rate)
+
+
+class OSCServerBase(object):
+    """Bind callbacks to OSC addresses, and find the ones to call.
+
+    Keeps track of the callbacks bound to addresses on each socket of a
+    server, and resolves the callbacks matching the received addresses,
+    the subclasses implement receiving and sending messages.
 
     The '/_oscpy/' namespace is reserved for metadata about the OSCPy
     internals, please see package documentation for further details.
     """
 
     def __init__(
-        self, drop_late_bundles=False, timeout=0.01, advanced_matching=False,
-        encoding='', encoding_errors='strict', default_handler=None, intercept_errors=True,
-        validate_message_address=True
+        self, drop_late_bundles=False, advanced_matching=False,
+        encoding='', encoding_errors='strict', default_handler=None,
+        intercept_errors=True, validate_message_address=True,
+        zero_copy=False, numpy_arrays=False, match_cache_size=1024,
+        incoming_patterns=False
     ):
-        """Create an OSCThreadServer.
-
-        - `timeout` is a number of seconds used as a time limit for
-          select() calls in the listening thread, optiomal, defaults to
-          0.01.
-        - `drop_late_bundles` instruct the server not to dispatch calls
-          from bundles that arrived after their timetag value.
-          (optional, defaults to False)
-        - `advanced_matching` (defaults to False), setting this to True
-          activates the pattern matching part of the specification, let
-          this to False if you don't need it, as it triggers a lot more
-          computation for each received message.
-        - `encoding` if defined, will be used to encode/decode all
-          strings sent/received to/from unicode/string objects, if left
-          empty, the interface will only accept bytes and return bytes
-          to callback functions.
-        - `encoding_errors` if `encoding` is set, this value will be
-          used as `errors` parameter in encode/decode calls.
-        - `default_handler` if defined, will be used to handle any
-          message that no configured address matched, the received
-          arguments will be (address, *values).
-        - `intercept_errors`, if True, means that exception raised by
-          callbacks will be intercepted and logged. If False, the handler
-          thread will terminate mostly silently on such exceptions.
-        - `validate_message_address`, if True, require received messages
-          to have an address beginning with the specified OSC address
-          pattern of '/'. Set to False to accept messages from
-          implementations that ignore the address pattern specification.
-        """
-        self._must_loop = True
-        self._termination_event = Event()
+        """See `OSCThreadServer` for the documentation of the parameters."""
+        if advanced_matching and incoming_patterns:
+            raise ValueError(
+                'advanced_matching and incoming_patterns are exclusive'
+            )
 
         self.addresses = {}
-        self.sockets = []
-        self.timeout = timeout
+        self._routes = {}
+        self._match_caches = {}
+        self.match_cache_size = match_cache_size
         self.default_socket = None
         self.drop_late_bundles = drop_late_bundles
         self.advanced_matching = advanced_matching
+        self.incoming_patterns = incoming_patterns
         self.encoding = encoding
         self.encoding_errors = encoding_errors
         self.default_handler = default_handler
         self.intercept_errors = intercept_errors
         self.validate_message_address = validate_message_address
+        self.zero_copy = zero_copy
+        self.numpy_arrays = numpy_arrays
 
         self.stats_received = Stats()
         self.stats_sent = Stats()
-
-        t = Thread(target=self._run_listener)
-        t.daemon = True
-        t.start()
-        self._thread = t
+        self.stats_dispatch = Counter()
 
         self._smart_address_cache = {}
         self._smart_part_cache = {}
-
-    def bind(self, address, callback, sock=None, get_address=False):
+        # filled from received patterns, so bounded
+        self._pattern_part_cache = LRUCache(match_cache_size)
+        self._throttling = False
+
+    def bind(
+        self, address, callback, sock=None, get_address=False, process=False,
+        answer_address=None, coalesce=False, max_rate=None, per_sender=False,
+        burst=1
+    ):
         """Bind a callback to an osc address.
 
         A socket in the list of existing sockets of the server can be
@@ -127,6 +324,28 @@ class OSCThreadServer(object):
         RuntimeError is raised.
 
         Multiple callbacks can be bound to the same address.
+
+        If `process` is True, the callback is run in a pool of processes
+        (see the `processes` parameter of the server), so CPU bound
+        callbacks can use more than one core, the callback and its
+        values must then be picklable. If all the callbacks matching a
+        message are bound this way, the message is decoded in the pool,
+        and not by the server. If `answer_address` is set, the value
+        returned by the callback, unless None, is sent back to the
+        sender of the message at that address.
+
+        If `coalesce` is True, only the latest message received for an
+        address is given to the callback, when the server falls behind,
+        older ones are skipped without being decoded. See
+        `OSCThreadServer` for when messages are dispatched.
+
+        If `max_rate` is set, the callback is called at most `max_rate`
+        times per second (and `burst` times in a row), by all the
+        senders, or by each sender if `per_sender` is True. Excess
+        messages are dropped before being decoded, and counted as
+        `throttled` in `stats_dispatch`, unless `coalesce` is also True,
+        in which case the latest one is kept until the callback can be
+        called.
         """
         if not sock and self.default_socket:
             sock = self.default_socket
@@ -137,20 +356,62 @@ class OSCThreadServer(object):
             address = address.encode(
                 self.encoding, errors=self.encoding_errors)
 
+        if isinstance(answer_address, UNICODE) and self.encoding:
+            answer_address = answer_address.encode(
+                self.encoding, errors=self.encoding_errors)
+
+        if process:
+            callback = self._process_route(callback, answer_address)
+
+        if max_rate:
+            self._throttling = True
+            callback = ThrottledRoute(
+                callback, max_rate, per_sender=per_sender, burst=burst)
+
+        if coalesce:
+            callback = self._coalesced_route(callback)
+
+        key = (sock, address)
         if self.advanced_matching:
-            address = self.create_smart_address(address)
+            key = (sock, self.create_smart_address(address))
+
+        callbacks = self.addresses.get(key)
+        if callbacks is None:
+            callbacks = self.addresses[key] = []
+            if self.advanced_matching or self.incoming_patterns:
+                routes = self._routes.get(sock)
+                if routes is None:
+                    routes = self._routes[sock] = RouteTrie(
+                        self._convert_pattern_part if self.incoming_patterns
+                        else self._convert_part_to_regex
+                    )
+                routes.add(
+                    address, callbacks, literal=self.incoming_patterns)
 
-        callbacks = self.addresses.get((sock, address), [])
         cb = (callback, get_address)
         if cb not in callbacks:
             callbacks.append(cb)
-        self.addresses[(sock, address)] = callbacks
+        self._match_caches.pop(sock, None)
+
+    def _process_route(self, callback, answer_address):
+        """(internal) Wrap a callback bound with `process=True`."""
+        raise ValueError(
+            '{} does not support process=True'.format(type(self).__name__)
+        )
+
+    def _coalesced_route(self, callback):
+        """(internal) Wrap a callback bound with `coalesce=True`."""
+        raise ValueError(
+            '{} does not support coalesce=True'.format(type(self).__name__)
+        )
 
     def create_smart_address(self, address):
         """Create an advanced matching address from a string.
 
         The address will be split by '/' and each part will be converted
         into a regexp, using the rules defined in the OSC specification.
+        A '//' in the address (matching any number of parts) is converted
+        to None.
         """
         cache = self._smart_address_cache
 
@@ -160,45 +421,76 @@ class OSCThreadServer(object):
         else:
             parts = address.split(b'/')
             smart_parts = tuple(
-                re.compile(self._convert_part_to_regex(part)) for part in parts
+                None if is_descendant_part(parts, i)
+                else re.compile(self._convert_part_to_regex(part))
+                for i, part in enumerate(parts)
             )
             cache[address] = smart_parts
             return smart_parts
 
-    def _convert_part_to_regex(self, part):
-        cache = self._smart_part_cache
+    def _convert_pattern_part(self, part):
+        """(internal) Convert a part of a received address pattern.
 
-        if part in cache:
-            return cache[part]
+        The regexes are kept in a bounded cache, as the parts come from
+        clients, see `incoming_patterns`.
+        """
+        return self._convert_part_to_regex(part, self._pattern_part_cache)
+
+    def _convert_part_to_regex(self, part, cache=None):
+        if cache is None:
+            cache = self._smart_part_cache
+
+        smart_part = cache.get(part)
+        if smart_part is not None:
+            return smart_part
 
         else:
             r = [b'^']
+            in_brackets = in_braces = False
             for i, _ in enumerate(part):
                 # getting a 1 char byte string instead of an int in
                 # python3
                 c = part[i:i + 1]
-                if c == b'?':
+                if in_brackets:
+                    if c == b']':
+                        in_brackets = False
+                        r.append(b']')
+                    elif c in (b'!', b'^') and r[-1] == b'[':
+                        r.append(b'^')
+                    elif c == b'-':
+                        r.append(b'-')
+                    else:
+                        r.append(re.escape(c))
+                elif c == b'?':
                     r.append(b'.')
                 elif c == b'*':
-                    r.append(b'.*')
+                    # consecutive stars would only add backtracking
+                    if r[-1] != b'.*':
+                        r.append(b'.*')
                 elif c == b'[':
+                    in_brackets = True
                     r.append(b'[')
-                elif c == b'!' and r and r[-1] == b'[':
-                    r.append(b'^')
-                elif c == b']':
-                    r.append(b']')
-                elif c == b'{':
+                elif c == b'{' and not in_braces:
+                    in_braces = True
                     r.append(b'(')
-                elif c == b',':
+                elif c == b',' and in_braces:
                     r.append(b'|')
-                elif c == b'}':
+                elif c == b'}' and in_braces:
+                    in_braces = False
                     r.append(b')')
                 else:
-                    r.append(c)
+                    # anything else is literal, patterns can come from
+                    # clients with incoming_patterns
+                    r.append(re.escape(c))
 
             r.append(b'$')
 
-            smart_part = re.compile(b''.join(r))
+            try:
+                smart_part = re.compile(b''.join(r))
+            except re.error as e:
+                # patterns can come from clients, with incoming_patterns
+                raise ValueError(
+                    'invalid address pattern {!r}: {}'.format(part, e))
 
             cache[part] = smart_part
             return smart_part
@@ -217,6 +509,11 @@ class OSCThreadServer(object):
             address = address.encode(
                 self.encoding, errors=self.encoding_errors)
 
+        if self.advanced_matching:
+            address = self.create_smart_address(address)
+
+        # the list is updated in place, as it's also referenced by the
+        # routes index
         callbacks = self.addresses.get((sock, address), [])
         to_remove = []
         for cb in callbacks:
@@ -225,11 +522,467 @@ class OSCThreadServer(object):
 
         while to_remove:
             callbacks.remove(to_remove.pop())
+        self._match_caches.pop(sock, None)
 
-        self.addresses[(sock, address)] = callbacks
+    def _run_callbacks(self, context, callbacks_lists, values):
+        """(internal) Call the callbacks resolved for a message.
+
+        The `default_handler` is called if `callbacks_lists` is empty.
+        `context` is the `MessageContext` returned by `get_context`
+        while the callbacks run.
+        """
+        token = CURRENT_MESSAGE.set(context)
+        try:
+            self._call_callbacks(context.address, callbacks_lists, values)
+        finally:
+            CURRENT_MESSAGE.reset(token)
+
+    def _call_callbacks(self, address, callbacks_lists, values):
+        """(internal) Call the callbacks, see `_run_callbacks`."""
+        for bound_address, callbacks_list in callbacks_lists:
+            for cb, get_address in callbacks_list:
+                try:
+                    if get_address:
+                        cb(bound_address, *values)
+                    else:
+                        cb(*values)
+                except Exception:
+                    if self.intercept_errors:
+                        logger.error("Unhandled exception caught in oscpy server", exc_info=True)
+                    else:
+                        raise
+
+        if not callbacks_lists:
+            self.default_handler(address, *values)
+
+    def get_context(self):
+        """Return the `MessageContext` of the message being handled.
+
+        Can only be called from callbacks (or from tasks they created,
+        with `oscpy.aio`), a RuntimeError is raised otherwise.
+        """
+        context = CURRENT_MESSAGE.get()
+        if context is None:
+            raise RuntimeError('get_context() not called from a callback')
+        return context
+
+    def get_sender(self):
+        """Return the socket, ip and port of the message that is currently being managed.
+        Warning::
+
+            this method should only be called from inside the handling
+            of a message (i.e, inside a callback).
+        """
+        context = CURRENT_MESSAGE.get()
+        if context is None:
+            raise RuntimeError('get_sender() not called from a callback')
+
+        address, port = context.sender
+        return context.sock, address, port
+
+    def _resolve_callbacks(self, sock, address):
+        """(internal) Return the callbacks lists matching an address.
+
+        Only non empty lists of callbacks bound on `sock` are returned,
+        as (address, callbacks list) pairs, where the address is the one
+        to give to `get_address` callbacks.
+        """
+        advanced = self.advanced_matching
+        if advanced or (
+            self.incoming_patterns and PATTERN_CHARS.search(address)
+        ):
+            routes = self._routes.get(sock)
+            if not routes:
+                return []
+
+            if advanced:
+                def match(address):
+                    return [
+                        (address, callbacks_list)
+                        for _, callbacks_list in routes.match(address)
+                    ]
+            else:
+                match = routes.match_pattern
+
+            if not self.match_cache_size:
+                return match(address)
+
+            # the cache is replaced rather than cleared when routes
+            # change, so a result computed concurrently to a bind can
+            # only be stored in the discarded one
+            cache = self._match_caches.get(sock)
+            if cache is None:
+                cache = self._match_caches[sock] = LRUCache(
+                    self.match_cache_size)
+
+            callbacks_lists = cache.get(address)
+            if callbacks_lists is None:
+                callbacks_lists = cache[address] = match(address)
+            return callbacks_lists
+
+        callbacks_list = self.addresses.get((sock, address))
+        return [(address, callbacks_list)] if callbacks_list else []
+
+    def _route_message(self, sock, sender, message):
+        """(internal) Count a received message, and resolve its callbacks.
+
+        Return the (bound address, callbacks list) pairs to call with
+        the message, empty if it's for the `default_handler`, or None if
+        nothing is interested in it. Tags and values are only decoded
+        if something is interested in the message.
+        """
+        stats = self.stats_received
+        stats.calls += 1
+        stats.bytes += message.size
+
+        callbacks_lists = self._resolve_callbacks(sock, message.address)
+        if not callbacks_lists and not self.default_handler:
+            return None
+
+        if self._throttling and callbacks_lists:
+            callbacks_lists = self._throttle(callbacks_lists, sender, time())
+            if not callbacks_lists:
+                return None
+
+        tags = message.tags
+        if b'[' in tags:
+            # array brackets are not values, as when formatting messages
+            tags = tags.replace(b'[', b'').replace(b']', b'')
+        stats.params += len(tags)
+        stats.types.update(tags)
+        return callbacks_lists
+
+    def _throttle(self, callbacks_lists, sender, now):
+        """(internal) Remove the callbacks exceeding their `max_rate`.
+
+        Only the callbacks bound with `max_rate` and without `coalesce`
+        are checked, the removed ones are counted as `throttled`.
+        """
+        allowed = []
+        for bound_address, callbacks_list in callbacks_lists:
+            kept = [
+                cb for cb in callbacks_list
+                if not isinstance(cb[0], ThrottledRoute)
+                or cb[0].acquire(sender, now)
+            ]
+            if len(kept) < len(callbacks_list):
+                self.stats_dispatch['throttled'] += (
+                    len(callbacks_list) - len(kept))
+            if kept:
+                allowed.append((bound_address, kept))
+        return allowed
+
+    @staticmethod
+    def _match_address(smart_address, target_address):
+        """(internal) Check if provided `smart_address` matches address.
+
+        A `smart_address` is a list of regexps to match
+        against the parts of the `target_address`. The server resolves
+        addresses using a `RouteTrie`, which also handles '//'.
+        """
+        target_parts = target_address.split(b'/')
+        if len(target_parts) != len(smart_address):
+            return False
+
+        return all(
+            model.match(part)
+            for model, part in
+            zip(smart_address, target_parts)
+        )
+
+    def address(
+        self, address, sock=None, get_address=False, coalesce=False,
+        max_rate=None, per_sender=False, burst=1
+    ):
+        """Decorate functions to bind them from their definition.
+
+        `address` is the osc address to bind to the callback.
+        if `get_address` is set to True, the first parameter the
+        callback will receive will be the address that matched (useful
+        with advanced matching).
+        See `bind` for the other parameters.
+
+        example:
+            server = OSCThreadServer()
+            server.listen('localhost', 8000, default=True)
+
+            @server.address(b'/printer')
+            def printer(values):
+                print(values)
+
+            send_message(b'/printer', [b'hello world'])
+
+        note:
+            This won't work on methods as it'll call them as normal
+            functions, and the callback won't get a `self` argument.
+
+            To bind a method use the `address_method` decorator.
+        """
+        def decorator(callback):
+            self.bind(
+                address, callback, sock, get_address=get_address,
+                coalesce=coalesce, max_rate=max_rate, per_sender=per_sender,
+                burst=burst
+            )
+            return callback
+
+        return decorator
+
+    def address_method(self, address, sock=None, get_address=False):
+        """Decorate methods to bind them from their definition.
+
+        The class defining the method must itself be decorated with the
+        `ServerClass` decorator, the methods will be bound to the
+        address when the class is instantiated.
+
+        See `address` for more information about the parameters.
+
+        example:
+
+            osc = OSCThreadServer()
+            osc.listen(default=True)
+
+            @ServerClass
+            class MyServer(object):
+
+                @osc.address_method(b'/test')
+                def success(self, *args):
+                    print("success!", args)
+        """
+        def decorator(decorated):
+            decorated._address = (self, address, sock, get_address)
+            return decorated
+
+        return decorator
+
+    def bind_meta_routes(self, sock=None):
+        """This module implements osc routes to probe the internal state of a
+        live OSCPy server. These routes are placed in the /_oscpy/ namespace,
+        and provide information such as the version, the existing routes, and
+        usage statistics of the server over time.
+
+        These requests will be sent back to the client's address/port that sent
+        them, with the osc address suffixed with '/answer'.
+
+        examples:
+            '/_oscpy/version' -> '/_oscpy/version/answer'
+            '/_oscpy/stats/received' -> '/_oscpy/stats/received/answer'
+            '/_oscpy/stats/dropped' -> '/_oscpy/stats/dropped/answer'
+
+        messages to these routes require a port number as argument, to
+        know to which port to send to.
+        """
+        self.bind(b'/_oscpy/version', self._get_version, sock=sock)
+        self.bind(b'/_oscpy/routes', self._get_routes, sock=sock)
+        self.bind(b'/_oscpy/stats/received', self._get_stats_received, sock=sock)
+        self.bind(b'/_oscpy/stats/sent', self._get_stats_sent, sock=sock)
+        self.bind(b'/_oscpy/stats/dropped', self._get_stats_dropped, sock=sock)
+
+    def _get_version(self, port, *args):
+        self.answer(
+            b'/_oscpy/version/answer',
+            (__version__, ),
+            port=port
+        )
+
+    def _get_routes(self, port, *args):
+        self.answer(
+            b'/_oscpy/routes/answer',
+            [a[1] for a in self.addresses],
+            port=port
+        )
+
+    def _get_stats_received(self, port, *args):
+        self.answer(
+            b'/_oscpy/stats/received/answer',
+            self.stats_received.to_tuple(),
+            port=port
+        )
+
+    def _get_stats_sent(self, port, *args):
+        self.answer(
+            b'/_oscpy/stats/sent/answer',
+            self.stats_sent.to_tuple(),
+            port=port
+        )
+
+    def _get_stats_dropped(self, port, *args):
+        self.answer(
+            b'/_oscpy/stats/dropped/answer',
+            (self.stats_received.dropped, ),
+            port=port
+        )
+
+
+class OSCThreadServer(OSCServerBase):
+    """A thread-based OSC server.
+
+    Listens for osc messages in a thread, and dispatches the messages
+    values to callbacks from there.
+
+    See `OSCServerBase` for the methods binding callbacks to addresses.
+    """
+
+    def __init__(
+        self, drop_late_bundles=False, timeout=None, advanced_matching=False,
+        encoding='', encoding_errors='strict', default_handler=None, intercept_errors=True,
+        validate_message_address=True, zero_copy=False, numpy_arrays=False,
+        schedule_bundles=False, schedule_tolerance=0.001, max_scheduled=1024,
+        match_cache_size=1024, incoming_patterns=False, workers=0,
+        worker_queue_size=1024, processes=None, max_batch=64
+    ):
+        """Create an OSCThreadServer.
+
+        - `timeout` is a number of seconds used as a time limit for
+          select() calls in the listening thread, optional, defaults to
+          None. The thread is woken up as soon as a socket is added or
+          removed, or `terminate_server` is called, so waking it up
+          periodically is not needed.
+        - `drop_late_bundles` instruct the server not to dispatch calls
+          from bundles that arrived after their timetag value.
+          (optional, defaults to False)
+        - `advanced_matching` (defaults to False), setting this to True
+          activates the pattern matching part of the specification, let
+          this to False if you don't need it, as it triggers a lot more
+          computation for each received message.
+        - `incoming_patterns` (defaults to False), setting this to True
+          activates the pattern matching part of the specification the
+          way it's described there: the addresses of received messages
+          can contain wildcards, and are matched against the literal
+          addresses bound on the server, each matching callback is then
+          called (with the bound address as first parameter if bound
+          with `get_address`). Can't be used with `advanced_matching`,
+          which matches wildcards in bound addresses.
+        - `match_cache_size` is the number of distinct received addresses
+          for which the result of pattern matching is remembered, per
+          socket, the cache is emptied by any call to `bind` or `unbind`
+          on the socket, set to 0 to disable it, defaults to 1024.
+          With `incoming_patterns`, it's also the number of received
+          pattern parts for which the compiled regex is remembered.
+        - `encoding` if defined, will be used to encode/decode all
+          strings sent/received to/from unicode/string objects, if left
+          empty, the interface will only accept bytes and return bytes
+          to callback functions.
+        - `encoding_errors` if `encoding` is set, this value will be
+          used as `errors` parameter in encode/decode calls.
+        - `default_handler` if defined, will be used to handle any
+          message that no configured address matched, the received
+          arguments will be (address, *values).
+          Messages are routed using only their address, the tags and
+          values of messages that neither match an address nor can be
+          given to a `default_handler` are never decoded, and are only
+          counted in the `calls` and `bytes` of `stats_received`.
+        - `intercept_errors`, if True, means that exception raised by
+          callbacks will be intercepted and logged. If False, the handler
+          thread will terminate mostly silently on such exceptions.
+        - `validate_message_address`, if True, require received messages
+          to have an address beginning with the specified OSC address
+          pattern of '/'. Set to False to accept messages from
+          implementations that ignore the address pattern specification.
+        - `zero_copy`, if True, blobs are given to callbacks as
+          `memoryview` slices of the received datagram instead of bytes,
+          avoiding a copy of their data. Callbacks must copy them if they
+          need them after returning.
+        - `numpy_arrays`, if True, runs of at least two ints or floats in
+          received messages are given to callbacks as a single read-only
+          numpy array (requires numpy).
+        - `schedule_bundles`, if True, messages from bundles with a
+          timetag in the future are kept until that time, and dispatched
+          then, instead of being dispatched as soon as they are received.
+        - `schedule_tolerance` is the number of seconds a scheduled
+          message can be dispatched before its timetag, to compensate for
+          the scheduling jitter of the listening thread, defaults to
+          0.001.
+        - `max_scheduled` is the maximum number of messages waiting for
+          their timetag, further future messages are dropped until some
+          of the waiting ones are dispatched, defaults to 1024.
+        - `workers`, if not 0, is the number of threads used to run the
+          callbacks, the listening thread then only reads and decodes
+          messages, so slow callbacks don't prevent it from emptying the
+          sockets buffers. Messages with the same address are always
+          handled by the same worker, in the order they were received.
+          Defaults to 0, running callbacks in the listening thread.
+        - `worker_queue_size` is the number of messages each worker can
+          have waiting, further messages are dropped and counted as
+          `rejected` in `stats_dispatch`. See `queue_depth`.
+        - `max_batch` is the maximum number of datagrams read from a
+          socket each time select() reports it as readable, reading stops
+          earlier when the socket is empty. The number of datagrams read
+          each time is counted in `stats_batches`. Defaults to 64.
+        - `processes` is the number of processes of the pool running the
+          callbacks bound with `process=True`, defaults to the number of
+          CPUs. The pool is only started by the first such `bind`, its
+          processes don't fork the server's, so the callbacks must be
+          importable from a module.
+
+        Messages with a timetag are counted in `stats_dispatch`, as
+        `early` if dispatched before their timetag (within
+        `schedule_tolerance`), `on_time` if dispatched less than
+        `schedule_tolerance` after it, and `late` otherwise. Messages
+        put aside to wait for their timetag are counted in `scheduled`,
+        and the ones dropped because too many were waiting in
+        `overflow` (datagrams dropped by the system are counted in
+        `stats_received.dropped`, see `listen`).
+
+        Messages for callbacks bound with `coalesce=True` are kept aside
+        until the datagrams pending on the sockets have been read (up to
+        `max_batch` per socket), then only the latest message of each
+        address is given to these callbacks, the replaced ones are
+        counted as `superseded`. If they are also bound with `max_rate`,
+        the latest message is kept until the callback can be called.
+        """
+        super(OSCThreadServer, self).__init__(
+            drop_late_bundles=drop_late_bundles,
+            advanced_matching=advanced_matching, encoding=encoding,
+            encoding_errors=encoding_errors, default_handler=default_handler,
+            intercept_errors=intercept_errors,
+            validate_message_address=validate_message_address,
+            zero_copy=zero_copy, numpy_arrays=numpy_arrays,
+            match_cache_size=match_cache_size,
+            incoming_patterns=incoming_patterns
+        )
+
+        self._must_loop = True
+        self._termination_event = Event()
+
+        self.sockets = []
+        self.timeout = timeout
+        self._selector = DefaultSelector()
+        # written to, to wake up the listening thread
+        self._wakeup_read, self._wakeup_write = socket.socketpair()
+        self._wakeup_read.setblocking(False)
+        self._wakeup_write.setblocking(False)
+        self._selector.register(self._wakeup_read, EVENT_READ)
+        self._drop_counters = {}
+        self.max_batch = max_batch
+        self.stats_batches = Counter()
+        self.schedule_bundles = schedule_bundles
+        self.schedule_tolerance = schedule_tolerance
+        self.max_scheduled = max_scheduled
+        self._scheduled = []
+
+        self.processes = processes
+        self._pool = None
+
+        self._coalescing = False
+
+        self._work_queues = []
+        for i in range(workers):
+            work_queue = Queue(worker_queue_size)
+            worker = Thread(target=self._run_worker, args=(work_queue, ))
+            worker.daemon = True
+            worker.start()
+            self._work_queues.append(work_queue)
+
+        t = Thread(target=self._run_listener)
+        t.daemon = True
+        t.start()
+        self._thread = t
 
     def listen(
-        self, address='localhost', port=0, default=False, family='inet'
+        self, address='localhost', port=0, default=False, family='inet',
+        reuse_port=False, recv_buffer_size=None, force_recv_buffer=False,
+        track_drops=False
     ):
         """Start listening on an (address, port).
 
@@ -241,10 +994,35 @@ class OSCThreadServer(object):
           If family is 'unix', then the address must be a filename, the
           `port` value won't be used. 'unix' sockets are not defined on
           Windows.
+        - if `reuse_port` is True, the SO_REUSEPORT option is set on the
+          socket, allowing other sockets with the option (possibly in
+          other processes) to listen on the same port, the system then
+          spreads the received datagrams among them, by sender. See
+          `oscpy.sharding`. Not available on all systems.
+        - `recv_buffer_size`, if set, is the size requested for the
+          receive buffer of the socket (SO_RCVBUF), datagrams received
+          while it's full are dropped by the system, the system may
+          adjust the value, and caps it (net.core.rmem_max on linux).
+        - `force_recv_buffer`, if True, the buffer size is set with
+          SO_RCVBUFFORCE, ignoring the system cap, this requires the
+          CAP_NET_ADMIN capability on linux, and falls back to SO_RCVBUF
+          if it's missing.
+        - `track_drops`, if True, the number of datagrams dropped by the
+          system for this socket is counted in `stats_received.dropped`,
+          and can be queried with the '/_oscpy/stats/dropped' meta route.
+          Requires SO_RXQ_OVFL (linux), a ValueError is raised otherwise.
 
         The socket created to listen is returned, and can be used later
         with methods accepting the `sock` parameter.
         """
+        if reuse_port and (
+            family != 'inet' or not hasattr(socket, 'SO_REUSEPORT')
+        ):
+            raise ValueError(
+                'reuse_port is only supported for inet sockets on systems '
+                'defining SO_REUSEPORT'
+            )
+
         if family == 'unix':
             family_ = socket.AF_UNIX
         elif family == 'inet':
@@ -254,13 +1032,32 @@ class OSCThreadServer(object):
                 "Unknown socket family, accepted values are 'unix' and 'inet'"
             )
 
+        if track_drops and (
+            SO_RXQ_OVFL is None or not hasattr(socket.socket, 'recvmsg')
+        ):
+            raise ValueError('track_drops is only supported on linux')
+
         sock = socket.socket(family_, socket.SOCK_DGRAM)
+        if reuse_port:
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+
+        if recv_buffer_size:
+            self._set_recv_buffer(sock, recv_buffer_size, force_recv_buffer)
+
+        if track_drops:
+            sock.setsockopt(socket.SOL_SOCKET, SO_RXQ_OVFL, 1)
+            self._drop_counters[sock] = 0
+
         if family == 'unix':
             addr = address
         else:
             addr = (address, port)
         sock.bind(addr)
+        if not RECV_FLAGS:
+            sock.setblocking(False)
         self.sockets.append(sock)
+        self._selector.register(sock, EVENT_READ)
+        self._wakeup()
         if default and not self.default_socket:
             self.default_socket = sock
         elif default:
@@ -271,6 +1068,20 @@ class OSCThreadServer(object):
         self.bind_meta_routes(sock)
         return sock
 
+    @staticmethod
+    def _set_recv_buffer(sock, size, force=False):
+        """(internal) Set the receive buffer size of `sock`."""
+        if force and SO_RCVBUFFORCE is not None:
+            try:
+                sock.setsockopt(socket.SOL_SOCKET, SO_RCVBUFFORCE, size)
+                return
+            except OSError:
+                logger.warning(
+                    "Can't force the receive buffer size, "
+                    "using SO_RCVBUF instead"
+                )
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, size)
+
     def close(self, sock=None):
         """Close a socket opened by the server."""
         if not sock and self.default_socket:
@@ -281,6 +1092,7 @@ class OSCThreadServer(object):
         if platform != 'win32' and sock.family == socket.AF_UNIX:
             os.unlink(sock.getsockname())
         else:
+            self._unregister(sock)
             sock.close()
 
         if sock == self.default_socket:
@@ -311,10 +1123,9 @@ class OSCThreadServer(object):
             s = self.default_socket
 
         if s in self.sockets:
-            read = select([s], [], [], 0)
+            self._unregister(s)
+            self._drop_counters.pop(s, None)
             s.close()
-            if s in read:
-                s.recvfrom(65535)
             self.sockets.remove(s)
         else:
             raise RuntimeError('{} is not one of my sockets!'.format(s))
@@ -331,6 +1142,23 @@ class OSCThreadServer(object):
         May be called from an event, too.
         """
         self._must_loop = False
+        self._wakeup()
+
+    def _wakeup(self):
+        """(internal) Interrupt the select() call of the listening thread."""
+        try:
+            self._wakeup_write.send(b'\0')
+        except (BlockingIOError, OSError):
+            # already full of wake up requests, or server terminated
+            pass
+
+    def _unregister(self, sock):
+        """(internal) Stop watching a socket before it's closed."""
+        try:
+            self._selector.unregister(sock)
+        except (KeyError, ValueError, RuntimeError):
+            pass
+        self._wakeup()
 
     def join_server(self, timeout=None):
         """Wait for the server to exit (`terminate_server()` must have been called before).
@@ -343,8 +1171,116 @@ class OSCThreadServer(object):
         try:
             self._listen()
         finally:
+            self._selector.close()
+            self._wakeup_read.close()
+            self._wakeup_write.close()
+            if self._pool is not None:
+                self._pool.close()
+            # workers finish the messages they already have
+            for work_queue in self._work_queues:
+                try:
+                    work_queue.put_nowait(None)
+                except Full:
+                    pass
             self._termination_event.set()
 
+    def _run_worker(self, work_queue):
+        """(internal) Run the callbacks for messages given to a worker."""
+        run = self._run_callbacks
+        while True:
+            work = work_queue.get()
+            if work is None:
+                return
+
+            try:
+                run(*work)
+            except Exception:
+                # intercept_errors is False, stop the server as the
+                # listening thread would
+                self.terminate_server()
+                raise
+
+    def _process_route(self, callback, answer_address):
+        """(internal) Wrap a callback to run it in the process pool."""
+        if self._pool is None:
+            # the server threads are already running, forking now could
+            # copy locks held by them (e.g. the encoder caches) into the
+            # children, so their processes are started from a clean one
+            try:
+                context = get_context('forkserver')
+            except ValueError:
+                context = get_context('spawn')
+            self._pool = context.Pool(self.processes)
+        return ProcessRoute(self, callback, answer_address)
+
+    def _coalesced_route(self, callback):
+        """(internal) Wrap a callback to call it with the latest message."""
+        self._coalescing = True
+        return CoalescedRoute(callback)
+
+    @staticmethod
+    def _split_coalesced(callbacks_lists):
+        """(internal) Separate the coalesced callbacks from the others.
+
+        Return the (bound address, callbacks list) pairs of the callbacks
+        to call for each message, and of the coalesced ones.
+        """
+        immediate = []
+        coalesced = []
+        for bound_address, callbacks_list in callbacks_lists:
+            others = [
+                cb for cb in callbacks_list
+                if not isinstance(cb[0], CoalescedRoute)
+            ]
+            if others:
+                immediate.append((bound_address, others))
+            if len(others) < len(callbacks_list):
+                coalesced.append((bound_address, [
+                    cb for cb in callbacks_list
+                    if isinstance(cb[0], CoalescedRoute)
+                ]))
+        return immediate, coalesced
+
+    @staticmethod
+    def _split_throttled(callbacks_lists, sender, now):
+        """(internal) Separate the coalesced callbacks exceeding `max_rate`.
+
+        Return the (bound address, callbacks list) pairs of the callbacks
+        that can be called, of the ones that must wait, and the number of
+        seconds before one of the latter can be called, or None.
+        """
+        ready = []
+        waiting = []
+        retry = None
+        for bound_address, callbacks_list in callbacks_lists:
+            allowed = []
+            held = []
+            for cb in callbacks_list:
+                route = cb[0].callback
+                if (
+                    not isinstance(route, ThrottledRoute)
+                    or route.acquire(sender, now)
+                ):
+                    allowed.append(cb)
+                    continue
+
+                held.append(cb)
+                delay = route.delay(sender, now)
+                if retry is None or delay < retry:
+                    retry = delay
+
+            if allowed:
+                ready.append((bound_address, allowed))
+            if held:
+                waiting.append((bound_address, held))
+        return ready, waiting, retry
+
+    def queue_depth(self):
+        """Return the number of messages waiting for a worker."""
+        return sum(
+            work_queue.qsize() for work_queue in self._work_queues
+        )
+
     def _listen(self):
         """(internal) Busy loop to listen for events.
 
@@ -353,91 +1289,244 @@ class OSCThreadServer(object):
         sockets, and calling the callbacks when messages are received.
         """
 
-        match = self._match_address
-        advanced_matching = self.advanced_matching
-        addresses = self.addresses
+        route = self._route_message
+        run_callbacks = self._run_callbacks
         stats = self.stats_received
+        dispatch_stats = self.stats_dispatch
+        batch_stats = self.stats_batches
+        drop_counters = self._drop_counters
+        selector = self._selector
+        wakeup = self._wakeup_read
+        scheduled = self._scheduled
+        work_queues = self._work_queues
+        split_coalesced = self._split_coalesced
+        split_throttled = self._split_throttled
+        # the latest message of each (socket, address) for coalesced
+        # callbacks, dispatched after reading the sockets
+        pending = {}
+        # ensures messages scheduled for the same time keep their order
+        sequence = count()
+
+        def _dispatch(sender_socket, sender, timetag, message, received):
+            if timetag is not None:
+                delay = time() - timetag
+                if delay < 0:
+                    dispatch_stats['early'] += 1
+                elif delay <= self.schedule_tolerance:
+                    dispatch_stats['on_time'] += 1
+                else:
+                    dispatch_stats['late'] += 1
+
+            callbacks_lists = route(sender_socket, sender, message)
+            if callbacks_lists is None:
+                return
+
+            if self._coalescing and callbacks_lists:
+                callbacks_lists, coalesced = split_coalesced(callbacks_lists)
+                if coalesced:
+                    key = (sender_socket, message.address)
+                    if key in pending:
+                        dispatch_stats['superseded'] += 1
+                    pending[key] = (
+                        sender, timetag, message, received, coalesced)
+                    if not callbacks_lists:
+                        return
+
+            _deliver(
+                sender_socket, sender, timetag, message, received,
+                callbacks_lists
+            )
 
-        def _execute_callbacks(_callbacks_list):
-            for cb, get_address in _callbacks_list:
-                try:
-                    if get_address:
-                        cb(address, *values)
-                    else:
-                        cb(*values)
-                except Exception as exc:
-                    if self.intercept_errors:
-                        logger.error("Unhandled exception caught in oscpy server", exc_info=True)
+        def _deliver(
+            sender_socket, sender, timetag, message, received,
+            callbacks_lists
+        ):
+            if self._pool is not None and callbacks_lists and all(
+                isinstance(cb, ProcessRoute)
+                for _, callbacks_list in callbacks_lists
+                for cb, _ in callbacks_list
+            ):
+                # let the pool decode the message
+                data = message.data[
+                    message.offset:message.offset + message.size]
+                for bound_address, callbacks_list in callbacks_lists:
+                    for route, get_address in callbacks_list:
+                        route.submit(
+                            sender_socket, sender, data=data,
+                            prefix=(bound_address, ) if get_address else ()
+                        )
+                return
+
+            address = message.address
+            values = message.values
+            context = MessageContext(
+                sender_socket, sender, address, timetag, message.data,
+                received
+            )
+
+            if not work_queues:
+                run_callbacks(context, callbacks_lists, values)
+                return
+
+            # a given address is always handled by the same worker, to
+            # keep its messages in order
+            work_queue = work_queues[hash(address) % len(work_queues)]
+            try:
+                work_queue.put_nowait((context, callbacks_lists, values))
+            except Full:
+                dispatch_stats['rejected'] += 1
+
+        def _flush():
+            # return the number of seconds before the messages kept for
+            # throttled callbacks can be delivered, or None
+            if not pending:
+                return None
+
+            now = time()
+            retry = None
+            # in the order the addresses were first received
+            messages = list(pending.items())
+            pending.clear()
+            for key, (
+                sender, timetag, message, received, callbacks_lists
+            ) in messages:
+                if self._throttling:
+                    callbacks_lists, waiting, delay = split_throttled(
+                        callbacks_lists, sender, now)
+                    if waiting:
+                        pending[key] = (
+                            sender, timetag, message, received, waiting)
+                        if retry is None or delay < retry:
+                            retry = delay
+
+                if callbacks_lists:
+                    _handle(
+                        _deliver, key[0], sender, timetag, message,
+                        received, callbacks_lists
+                    )
+            return retry
+
+        def _handle(handler, *args):
+            try:
+                handler(*args)
+            except ValueError:
+                if self.intercept_errors:
+                    logger.error(
+                        "Unhandled ValueError caught in oscpy server",
+                        exc_info=True
+                    )
+                else:
+                    raise
+
+        def _receive(sender_socket, sender, data):
+            tolerance = self.schedule_tolerance
+            schedule = self.schedule_bundles
+            now = time()
+
+            # messages are dispatched as soon as they are read,
+            # before the rest of the packet is parsed
+            for timetag, message in iter_packet(
+                data, drop_late=drop_late, encoding=self.encoding,
+                encoding_errors=self.encoding_errors,
+                validate_message_address=self.validate_message_address,
+                zero_copy=self.zero_copy, lazy=True,
+                numpy_arrays=self.numpy_arrays
+            ):
+                if (
+                    schedule and timetag is not None
+                    and timetag - tolerance > now
+                ):
+                    if len(scheduled) >= self.max_scheduled:
+                        dispatch_stats['overflow'] += 1
                     else:
-                        raise
+                        dispatch_stats['scheduled'] += 1
+                        heappush(scheduled, (
+                            timetag, next(sequence), sender_socket, sender,
+                            message, now
+                        ))
+                else:
+                    _dispatch(sender_socket, sender, timetag, message, now)
 
         while self._must_loop:
 
             drop_late = self.drop_late_bundles
-            if not self.sockets:
-                sleep(.01)
+            timeout = self.timeout
+
+            if scheduled:
+                now = time()
+                while (
+                    scheduled
+                    and scheduled[0][0] - self.schedule_tolerance <= now
+                ):
+                    timetag, _, sock, sender, message, received = heappop(
+                        scheduled)
+                    _handle(
+                        _dispatch, sock, sender, timetag, message, received)
+
+                if scheduled:
+                    wait = scheduled[0][0] - self.schedule_tolerance - now
+                    if timeout is None or wait < timeout:
+                        timeout = max(wait, 0)
+
+            # deliver the messages of the coalesced callbacks, now that
+            # the sockets were read
+            retry = _flush()
+            if retry is not None and (timeout is None or retry < timeout):
+                timeout = retry
+
+            try:
+                events = selector.select(timeout)
+            except (ValueError, OSError):
                 continue
-            else:
-                try:
-                    read, write, error = select(self.sockets, [], [], self.timeout)
-                except (ValueError, socket.error):
-                    continue
 
-            for sender_socket in read:
-                try:
-                    data, sender = sender_socket.recvfrom(65535)
-                except ConnectionResetError:
+            max_batch = self.max_batch
+            for key, _ in events:
+                sender_socket = key.fileobj
+                if sender_socket is wakeup:
+                    try:
+                        while wakeup.recv(4096):
+                            pass
+                    except (BlockingIOError, InterruptedError):
+                        pass
                     continue
 
-                try:
-                    for address, tags, values, offset in read_packet(
-                        data, drop_late=drop_late, encoding=self.encoding,
-                        encoding_errors=self.encoding_errors,
-                        validate_message_address=self.validate_message_address
-                    ):
-                        stats.calls += 1
-                        stats.bytes += offset
-                        stats.params += len(values)
-                        stats.types.update(tags)
-
-                        matched = False
-                        if advanced_matching:
-                            for sock, addr in addresses:
-                                if sock == sender_socket and match(addr, address):
-                                    callbacks_list = addresses.get((sock, addr), [])
-                                    if callbacks_list:
-                                        matched = True
-                                        _execute_callbacks(callbacks_list)
+                # None if the socket doesn't track drops
+                drops = drop_counters.get(sender_socket)
+
+                # read all the pending datagrams, up to max_batch, before
+                # going back to select
+                batch = 0
+                while batch < max_batch:
+                    try:
+                        if drops is None:
+                            data, sender = sender_socket.recvfrom(
+                                65535, RECV_FLAGS)
                         else:
-                            callbacks_list = addresses.get((sender_socket, address), [])
-                            if callbacks_list:
-                                matched = True
-                                _execute_callbacks(callbacks_list)
-
-                        if not matched and self.default_handler:
-                            self.default_handler(address, *values)
-                except ValueError:
-                    if self.intercept_errors:
-                        logger.error("Unhandled ValueError caught in oscpy server", exc_info=True)
-                    else:
-                        raise
-
-    @staticmethod
-    def _match_address(smart_address, target_address):
-        """(internal) Check if provided `smart_address` matches address.
-
-        A `smart_address` is a list of regexps to match
-        against the parts of the `target_address`.
-        """
-        target_parts = target_address.split(b'/')
-        if len(target_parts) != len(smart_address):
-            return False
-
-        return all(
-            model.match(part)
-            for model, part in
-            zip(smart_address, target_parts)
-        )
+                            data, ancdata, _, sender = sender_socket.recvmsg(
+                                65535, DROPS_ANCILLARY_SIZE, RECV_FLAGS)
+                            for level, kind, value in ancdata:
+                                if (
+                                    level == socket.SOL_SOCKET
+                                    and kind == SO_RXQ_OVFL
+                                ):
+                                    # total drops since the option was set
+                                    total = DROPS.unpack_from(value)[0]
+                                    stats.dropped += (total - drops) % 2 ** 32
+                                    drop_counters[sender_socket] = total
+                                    drops = total
+                    except ConnectionResetError:
+                        continue
+                    except (BlockingIOError, InterruptedError):
+                        break
+                    except (OSError, ValueError):
+                        # the socket was closed by stop()
+                        break
+
+                    batch += 1
+                    _handle(_receive, sender_socket, sender, data)
+
+                if batch:
+                    batch_stats[batch] += 1
 
     def send_message(
         self, osc_address, values, ip_address, port, sock=None, safer=False
@@ -482,6 +1571,7 @@ class OSCThreadServer(object):
             messages,
             ip_address,
             port,
+            timetag=timetag,
             sock=sock,
             safer=safer,
             encoding=self.encoding,
@@ -490,24 +1580,6 @@ class OSCThreadServer(object):
         self.stats_sent += stats
         return stats
 
-    def get_sender(self):
-        """Return the socket, ip and port of the message that is currently being managed.
-        Warning::
-
-            this method should only be called from inside the handling
-            of a message (i.e, inside a callback).
-        """
-        frames = inspect.getouterframes(inspect.currentframe())
-        for frame, filename, _, function, _, _ in frames:
-            if function == '_listen' and __FILE__.startswith(filename):
-                break
-        else:
-            raise RuntimeError('get_sender() not called from a callback')
-
-        sock = frame.f_locals.get('sender_socket')
-        address, port = frame.f_locals.get('sender')
-        return sock, address, port
-
     def answer(
         self, address=None, values=None, bundle=None, timetag=None,
         safer=False, port=None
@@ -542,109 +1614,3 @@ class OSCThreadServer(object):
             return self.send_message(
                 address, values, ip_address, response_port, sock=sock
             )
-
-    def address(self, address, sock=None, get_address=False):
-        """Decorate functions to bind them from their definition.
-
-        `address` is the osc address to bind to the callback.
-        if `get_address` is set to True, the first parameter the
-        callback will receive will be the address that matched (useful
-        with advanced matching).
-
-        example:
-            server = OSCThreadServer()
-            server.listen('localhost', 8000, default=True)
-
-            @server.address(b'/printer')
-            def printer(values):
-                print(values)
-
-            send_message(b'/printer', [b'hello world'])
-
-        note:
-            This won't work on methods as it'll call them as normal
-            functions, and the callback won't get a `self` argument.
-
-            To bind a method use the `address_method` decorator.
-        """
-        def decorator(callback):
-            self.bind(address, callback, sock, get_address=get_address)
-            return callback
-
-        return decorator
-
-    def address_method(self, address, sock=None, get_address=False):
-        """Decorate methods to bind them from their definition.
-
-        The class defining the method must itself be decorated with the
-        `ServerClass` decorator, the methods will be bound to the
-        address when the class is instantiated.
-
-        See `address` for more information about the parameters.
-
-        example:
-
-            osc = OSCThreadServer()
-            osc.listen(default=True)
-
-            @ServerClass
-            class MyServer(object):
-
-                @osc.address_method(b'/test')
-                def success(self, *args):
-                    print("success!", args)
-        """
-        def decorator(decorated):
-            decorated._address = (self, address, sock, get_address)
-            return decorated
-
-        return decorator
-
-    def bind_meta_routes(self, sock=None):
-        """This module implements osc routes to probe the internal state of a
-        live OSCPy server. These routes are placed in the /_oscpy/ namespace,
-        and provide information such as the version, the existing routes, and
-        usage statistics of the server over time.
-
-        These requests will be sent back to the client's address/port that sent
-        them, with the osc address suffixed with '/answer'.
-
-        examples:
-            '/_oscpy/version' -> '/_oscpy/version/answer'
-            '/_oscpy/stats/received' -> '/_oscpy/stats/received/answer'
-
-        messages to these routes require a port number as argument, to
-        know to which port to send to.
-        """
-        self.bind(b'/_oscpy/version', self._get_version, sock=sock)
-        self.bind(b'/_oscpy/routes', self._get_routes, sock=sock)
-        self.bind(b'/_oscpy/stats/received', self._get_stats_received, sock=sock)
-        self.bind(b'/_oscpy/stats/sent', self._get_stats_sent, sock=sock)
-
-    def _get_version(self, port, *args):
-        self.answer(
-            b'/_oscpy/version/answer',
-            (__version__, ),
-            port=port
-        )
-
-    def _get_routes(self, port, *args):
-        self.answer(
-            b'/_oscpy/routes/answer',
-            [a[1] for a in self.addresses],
-            port=port
-        )
-
-    def _get_stats_received(self, port, *args):
-        self.answer(
-            b'/_oscpy/stats/received/answer',
-            self.stats_received.to_tuple(),
-            port=port
-        )
-
-    def _get_stats_sent(self, port, *args):
-        self.answer(
-            b'/_oscpy/stats/sent/answer',
-            self.stats_sent.to_tuple(),
-            port=port
-        )
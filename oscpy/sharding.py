@@ -0,0 +1,225 @@
+"""Multi-process servers sharing an UDP port.
+
+`ShardedServer` starts processes each running an `OSCThreadServer`
+listening on the same port (using `reuse_port`), the system spreads the
+received datagrams among them by sender, so receiving, decoding and
+dispatching messages can use more than one core.
+
+The routes are defined by a `setup` function, called in each process
+with its server. The processes are spawned, not forked, so it must be
+defined in a module every process can import.
+"""
+
+from importlib import import_module
+from multiprocessing import get_context, cpu_count
+from time import time
+
+try:
+    from queue import Empty
+except ImportError:
+    from Queue import Empty
+
+from oscpy.server import OSCThreadServer
+from oscpy.stats import Stats
+
+
+def resolve_setup(setup):
+    """Return the function designated by `setup`.
+
+    `setup` is either a function, or a 'module:function' string, the
+    function defaults to 'setup' if only a module is given.
+    """
+    if callable(setup):
+        return setup
+
+    module, _, name = setup.partition(':')
+    return getattr(import_module(module), name or 'setup')
+
+
+def _run_shard(
+    index, setup, address, port, server_kwargs, stats_queue, stop,
+    stats_interval
+):
+    """(internal) Run a server of a `ShardedServer`, in its own process.
+
+    The stats of the server are sent periodically to the parent process,
+    the first message (with the port instead of stats) tells the server
+    is ready.
+    """
+    server = OSCThreadServer(**server_kwargs)
+    server.listen(address, port, default=True, reuse_port=True)
+    resolve_setup(setup)(server)
+    stats_queue.put((index, server.getaddress()[1]))
+
+    def send_stats():
+        try:
+            stats = Stats() + server.stats_received
+        except RuntimeError:
+            # changed by the listening thread while copied, next time
+            return
+        stats_queue.put((index, stats))
+
+    try:
+        while not stop.wait(stats_interval):
+            send_stats()
+    finally:
+        server.stop_all()
+        server.terminate_server()
+        server.join_server(timeout=1)
+        send_stats()
+
+
+class ShardedServer(object):
+    """Run `processes` servers listening on the same UDP port.
+
+    The stats of all the servers are collected by the parent process,
+    and available as `stats_received`.
+
+    example:
+        # routes.py
+        def setup(server):
+            @server.address(b'/ping')
+            def ping(*values):
+                server.answer(b'/pong', values)
+
+        # main.py
+        with ShardedServer('routes:setup', port=8000) as shards:
+            ...
+    """
+
+    def __init__(
+        self, setup, processes=None, address='localhost', port=0,
+        stats_interval=0.5, **server_kwargs
+    ):
+        """Create a ShardedServer, `start` must be called to run it.
+
+        - `setup` is a function called with the `OSCThreadServer` of each
+          process, to bind its routes, or a 'module:function' string
+          designating it, see `resolve_setup`.
+        - `processes` is the number of processes, defaults to the number
+          of CPUs.
+        - `address` and `port` are the address to listen on, if `port` is
+          0, a free port is allocated, see `getaddress`.
+        - `stats_interval` is the number of seconds between two updates
+          of the stats of a process.
+
+        Other keyword arguments are given to `OSCThreadServer`.
+        """
+        self.setup = setup
+        self.processes = processes or cpu_count()
+        self.address = address
+        self.port = port
+        self.stats_interval = stats_interval
+        self.server_kwargs = server_kwargs
+
+        # the processes are spawned rather than forked, forking while
+        # the threads of other oscpy servers run could copy locks they
+        # hold (e.g. the encoder caches) into the children
+        self._context = get_context('spawn')
+        self._stats = {}
+        self._stats_queue = self._context.Queue()
+        self._stop = self._context.Event()
+        self._processes = []
+
+    def start(self, timeout=10):
+        """Start the processes, and wait for all of them to listen.
+
+        If `port` is 0, the first process is started alone, to allocate
+        the port the others will use.
+
+        A RuntimeError is raised if they are not ready before `timeout`.
+        """
+        end = time() + timeout
+        self._start_process(0)
+        self._wait_ready(1, end)
+
+        for index in range(1, self.processes):
+            self._start_process(index)
+        self._wait_ready(self.processes - 1, end)
+
+    def _start_process(self, index):
+        """(internal) Start the process running the server `index`."""
+        process = self._context.Process(
+            target=_run_shard,
+            args=(
+                index, self.setup, self.address, self.port,
+                self.server_kwargs, self._stats_queue, self._stop,
+                self.stats_interval
+            )
+        )
+        process.daemon = True
+        process.start()
+        self._processes.append(process)
+
+    def _wait_ready(self, count, end):
+        """(internal) Wait for `count` processes to be listening."""
+        while count:
+            try:
+                index, stats = self._stats_queue.get(
+                    timeout=max(end - time(), 0))
+            except Empty:
+                self.stop()
+                raise RuntimeError('sharded servers failed to start')
+
+            if isinstance(stats, Stats):
+                self._stats[index] = stats
+            else:
+                self.port = stats
+                count -= 1
+
+    def stop(self, timeout=5):
+        """Stop the processes, and collect their last stats."""
+        self._stop.set()
+        end = time() + timeout
+        # the queue must be emptied for the processes to exit
+        while any(p.is_alive() for p in self._processes) and time() < end:
+            self._collect(timeout=.01)
+
+        for process in self._processes:
+            process.join(max(end - time(), 0))
+            if process.is_alive():
+                process.terminate()
+        self._collect()
+        self._processes = []
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *args):
+        self.stop()
+
+    def getaddress(self):
+        """Return the (address, port) the servers listen on."""
+        return self.address, self.port
+
+    def _collect(self, timeout=None):
+        """(internal) Read the stats sent by the processes."""
+        try:
+            while True:
+                if timeout is None:
+                    index, stats = self._stats_queue.get_nowait()
+                else:
+                    index, stats = self._stats_queue.get(timeout=timeout)
+                    timeout = None
+                if isinstance(stats, Stats):
+                    self._stats[index] = stats
+        except Empty:
+            pass
+
+    @property
+    def stats_received(self):
+        """The sum of the received stats of all the servers.
+
+        Stats are updated by the processes every `stats_interval`.
+        """
+        self._collect()
+        total = Stats()
+        for stats in self._stats.values():
+            total += stats
+        return total
+
+    def stats_by_process(self):
+        """Return the last received stats of each process, by index."""
+        self._collect()
+        return dict(self._stats)
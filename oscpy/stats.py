@@ -4,11 +4,21 @@ from collections import Counter
 
 
 class Stats(object):
-    def __init__(self, calls=0, bytes=0, params=0, types=None, **kwargs):
+    """Counts of messages, bytes, values and their types.
+
+    `dropped` counts the datagrams the system reported as dropped before
+    they could be read, see the `track_drops` parameter of
+    `OSCThreadServer.listen`, it's not part of `to_tuple`.
+    """
+
+    def __init__(
+        self, calls=0, bytes=0, params=0, types=None, dropped=0, **kwargs
+    ):
         self.calls = calls
         self.bytes = bytes
         self.params = params
         self.types = types or Counter()
+        self.dropped = dropped
         super(Stats, self).__init__(**kwargs)
 
     def to_tuple(self):
@@ -27,6 +37,7 @@ class Stats(object):
         self.bytes += other.bytes
         self.params += other.params
         self.types += other.types
+        self.dropped += other.dropped
         return self
 
     def __add__(self, other):
@@ -35,7 +46,8 @@ class Stats(object):
             calls=self.calls + other.calls,
             bytes=self.bytes + other.bytes,
             params=self.params + other.params,
-            types=self.types + other.types
+            types=self.types + other.types,
+            dropped=self.dropped + other.dropped
         )
 
     def __eq__(self, other):
@@ -45,6 +57,7 @@ class Stats(object):
             and self.bytes == self.bytes
             and self.params == self.params
             and self.types == other.types
+            and self.dropped == other.dropped
         )
 
     def __repr__(self):
@@ -65,5 +78,5 @@ class Stats(object):
                         for k in sorted(self.types)
                     )
                 )
-            )
+            ) + ((('dropped', self.dropped), ) if self.dropped else ())
         )
@@ -46,6 +46,7 @@ setup(
     extras_require={
         'dev': ['pytest>=3.6', 'wheel', 'pytest-cov', 'pycodestyle'],
         'ci': ['coveralls', 'pytest-rerunfailures'],
+        'numpy': ['numpy'],
     },
     package_data={},
     data_files=[],
@@ -0,0 +1,171 @@
+import asyncio
+import logging
+
+import pytest
+
+from oscpy.aio import OSCAsyncServer, OSCAsyncClient
+from oscpy import __version__
+
+
+async def wait_for(condition, timeout=2):
+    loop = asyncio.get_running_loop()
+    end = loop.time() + timeout
+    while not condition():
+        if loop.time() > end:
+            raise OSError('timeout while waiting for success message.')
+        await asyncio.sleep(0.001)
+
+
+def test_async_server():
+    async def main():
+        osc = OSCAsyncServer(encoding='utf8')
+        await osc.listen(default=True)
+        received = []
+
+        @osc.address(u'/sync')
+        def sync(*values):
+            received.append(('sync', values))
+
+        @osc.address(u'/coroutine', get_address=True)
+        async def coroutine(address, value):
+            await asyncio.sleep(0)
+            received.append((address, value))
+
+        async with OSCAsyncClient(
+            *osc.getaddress(), encoding='utf8'
+        ) as client:
+            await client.send_message(u'/sync', [1, u'a'])
+            await client.send_bundle([(u'/coroutine', [2.5])])
+            await wait_for(lambda: len(received) == 2)
+
+        assert received == [('sync', (1, u'a')), (b'/coroutine', 2.5)]
+        assert osc.stats_received.calls == 2
+        assert client.stats.calls == 2
+        osc.stop_all()
+
+    asyncio.run(main())
+
+
+def test_async_answer():
+    async def main():
+        osc = OSCAsyncServer(encoding='utf8')
+        await osc.listen(default=True)
+        client = OSCAsyncServer(encoding='utf8')
+        await client.listen(default=True)
+        answers = []
+
+        @osc.address(b'/ping')
+        async def ping(value):
+            await asyncio.sleep(0)
+            osc.answer(b'/pong', [value + 1])
+
+        client.bind(b'/pong', answers.append)
+        client.bind(b'/_oscpy/version/answer', answers.append)
+
+        await client.send_message(b'/ping', [1], *osc.getaddress())
+        await client.send_message(
+            b'/_oscpy/version', [client.getaddress()[1]], *osc.getaddress()
+        )
+        await wait_for(lambda: len(answers) == 2)
+
+        assert sorted(answers, key=str) == [__version__, 2]
+        assert client.stats_sent.calls == 2
+        with pytest.raises(RuntimeError):
+            osc.get_sender()
+        osc.stop_all()
+        client.stop_all()
+
+    asyncio.run(main())
+
+
+def test_async_context():
+    async def main():
+        osc = OSCAsyncServer()
+        await osc.listen(default=True)
+        contexts = []
+
+        @osc.address(b'/context')
+        async def context(value):
+            await asyncio.sleep(0.01)
+            contexts.append((value, osc.get_context()))
+
+        async with OSCAsyncClient(*osc.getaddress()) as client:
+            await client.send_message(b'/context', [1])
+            await client.send_bundle([(b'/context', [2])], timetag=1)
+            await wait_for(lambda: len(contexts) == 2)
+
+        (_, message), (_, bundled) = sorted(contexts, key=lambda c: c[0])
+        assert message.address == b'/context'
+        assert message.timetag is None
+        assert bundled.timetag == 1
+        assert bundled.packet.startswith(b'#bundle\0')
+        with pytest.raises(RuntimeError):
+            osc.get_context()
+        osc.stop_all()
+
+    asyncio.run(main())
+
+
+def test_async_max_rate():
+    async def main():
+        osc = OSCAsyncServer()
+        await osc.listen(default=True)
+        received = []
+        osc.bind(b'/rate', received.append, max_rate=10)
+
+        async with OSCAsyncClient(*osc.getaddress()) as client:
+            for i in range(10):
+                await client.send_message(b'/rate', [i])
+            await wait_for(lambda: osc.stats_received.calls == 10)
+
+        assert received == [0]
+        assert osc.stats_dispatch['throttled'] == 9
+        osc.stop_all()
+
+    asyncio.run(main())
+
+
+def test_async_errors(caplog):
+    async def main():
+        osc = OSCAsyncServer()
+        await osc.listen(default=True)
+        received = []
+
+        @osc.address(b'/fail')
+        async def fail():
+            raise ValueError('expected')
+
+        @osc.address(b'/fail_sync')
+        def fail_sync():
+            raise ValueError('expected')
+
+        @osc.address(b'/ok')
+        def ok():
+            received.append(True)
+
+        client = OSCAsyncClient(*osc.getaddress())
+        await client.send_message(b'/fail', [])
+        await client.send_message(b'/fail_sync', [])
+        await client.send_message(b'/ok', [])
+        await wait_for(lambda: received)
+        await asyncio.sleep(0.01)
+        client.close()
+        osc.stop_all()
+
+    with caplog.at_level(logging.ERROR):
+        asyncio.run(main())
+
+    assert len(caplog.records) == 2
+
+
+def test_async_unsupported():
+    async def main():
+        osc = OSCAsyncServer()
+        await osc.listen(default=True)
+        with pytest.raises(ValueError):
+            osc.bind(b'/process', print, process=True)
+        with pytest.raises(ValueError):
+            osc.bind(b'/coalesce', print, coalesce=True)
+        osc.stop_all()
+
+    asyncio.run(main())
@@ -0,0 +1,39 @@
+from oscpy.cache import LRUCache
+
+
+def test_cache_get_set():
+    cache = LRUCache(maxsize=2)
+    assert cache.get('a') is None
+    cache['a'] = 1
+    assert cache.get('a') == 1
+    assert 'a' in cache
+    assert len(cache) == 1
+
+
+def test_cache_eviction():
+    cache = LRUCache(maxsize=2)
+    cache['a'] = 1
+    cache['b'] = 2
+    # 'a' is now the most recently used
+    assert cache.get('a') == 1
+    cache['c'] = 3
+    assert 'a' in cache
+    assert 'b' not in cache
+    assert 'c' in cache
+
+
+def test_cache_info():
+    cache = LRUCache(maxsize=10)
+    cache.get('a')
+    cache['a'] = 1
+    cache.get('a')
+    cache.get('a')
+    info = cache.info()
+    assert info.hits == 2
+    assert info.misses == 1
+    assert info.maxsize == 10
+    assert info.currsize == 1
+
+    cache.clear()
+    assert len(cache) == 0
+    assert cache.info().hits == 2
@@ -1,6 +1,7 @@
 # coding: utf8
 
-from oscpy.client import send_message, send_bundle, OSCClient
+from oscpy.client import send_message, send_bundle, send_prepared, OSCClient
+from oscpy.parser import PreparedMessage
 from oscpy.server import OSCThreadServer
 from time import time, sleep
 
@@ -127,6 +128,32 @@ def test_oscclient():
         )
 
 
+def test_send_prepared():
+    osc = OSCThreadServer()
+    sock = osc.listen()
+    port = sock.getsockname()[1]
+    acc = []
+
+    def success(*values):
+        acc.append(values)
+
+    osc.bind(b'/success', success, sock)
+    prepared = PreparedMessage(b'/success', b'if')
+    client = OSCClient('localhost', port)
+
+    send_prepared(prepared, [1, 1.5], 'localhost', port)
+    client.send_prepared(prepared, [2, 2.5])
+    assert client.stats.calls == 1
+
+    timeout = time() + 5
+    while len(acc) < 2:
+        if time() > timeout:
+            raise OSError('timeout while waiting for success message.')
+        sleep(10e-9)
+
+    assert sorted(acc) == [(1, 1.5), (2, 2.5)]
+
+
 def test_timetag():
     osc = OSCThreadServer(drop_late_bundles=True)
     osc.drop_late_bundles = True
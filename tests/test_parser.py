@@ -1,11 +1,14 @@
 # coding: utf8
 
 from oscpy.parser import (
-    parse, padded, read_message, read_bundle, read_packet,
+    parse, parse_blob, padded, read_message, read_bundle, read_packet,
     format_message, format_bundle, timetag_to_time, time_to_timetag,
-    format_midi, format_true, format_false, format_nil, format_infinitum, MidiTuple
+    format_midi, format_true, format_false, format_nil, format_infinitum,
+    MidiTuple, ENCODER_CACHE, DECODER_CACHE, decode_values, LazyMessage,
+    RGBATuple, Double, Int64, format_message_into, format_bundle_into,
+    PreparedMessage, iter_bundle, iter_packet
 )
-from pytest import approx, raises
+from pytest import approx, raises, importorskip
 from time import time
 import struct
 from oscpy.stats import Stats
@@ -116,12 +119,75 @@ def test_parse_blob():
     assert result == data
 
 
+def test_parse_blob_zero_copy():
+    data = struct.pack('>i8s', 5, b'abcde')
+    result, size = parse_blob(data, zero_copy=True)
+    assert isinstance(result, memoryview)
+    assert result == b'abcde'
+    assert size == 12
+
+    with raises(ValueError):
+        parse_blob(struct.pack('>i4s', 5, b'abcd'))
+
+
+def test_parse_string_not_terminated():
+    with raises(ValueError):
+        parse(b's', b'test')
+
+
+def test_read_message_blob():
+    blob = bytearray(b'x' * 60000)
+    msg, stats = format_message(b'/blob', [blob, 1, b'after'])
+    address, tags, values, size = read_message(msg)
+    assert values == [blob, 1, b'after']
+    assert size == len(msg)
+
+    values = read_packet(msg, zero_copy=True)[0][2]
+    assert isinstance(values[0], memoryview)
+    assert values[0] == blob
+    assert values[1:] == [1, b'after']
+
+
+def test_read_memoryview():
+    msg, stats = format_message(b'/buffer', [1, b'text', bytearray(b'ab')])
+    buffer = bytearray(b'\0' * 4 + msg)
+    expected = [(b'/buffer', b'isb', [1, b'text', b'ab'], len(msg))]
+
+    view = memoryview(buffer)[4:]
+    assert [tuple(read_message(view))] == expected
+    assert read_packet(view) == expected
+    assert [tuple(m) for m in read_packet(view, lazy=True)] == expected
+
+    bundle, stats = format_bundle([(b'/buffer', [1, b'text'])])
+    messages = read_bundle(memoryview(bundle))[1]
+    assert [m[2] for m in messages] == [[1, b'text']]
+    assert [m[2] for t, m in iter_packet(memoryview(bundle))] == [[1, b'text']]
+
+
 def test_parse_midi():
     data = MidiTuple(0, 144, 72, 64)
     result = parse(b'm', struct.pack('>I', format_midi(data)))[0]
     assert result == data
 
 
+def test_parse_long():
+    assert parse(b'h', struct.pack('>q', 2 ** 40))[0] == 2 ** 40
+
+
+def test_parse_double():
+    assert parse(b'd', struct.pack('>d', 1.1))[0] == 1.1
+
+
+def test_parse_char():
+    assert parse(b'c', struct.pack('>i', ord('a')))[0] == b'a'
+    assert parse(b'c', struct.pack('>i', ord('a')), encoding='utf8')[0] == u'a'
+
+
+def test_parse_rgba():
+    data = struct.pack('>4B', 255, 128, 0, 10)
+    assert parse(b'r', data) == (RGBATuple(255, 128, 0, 10), 4)
+
+
 def test_parse_nil():
     result = parse(b'N', '')[0]
     assert result == None
@@ -162,6 +228,31 @@ def test_read_message():
     assert values == result[1]
 
 
+def test_read_message_decoder_cache():
+    DECODER_CACHE.clear()
+    values = [1.0] * 64 + [1, b'test', True, None, 2, 3.5]
+    msg, stats = format_message(b'/frame', values)
+    misses = DECODER_CACHE.info().misses
+    hits = DECODER_CACHE.info().hits
+
+    address, tags, result, size = read_message(msg)
+    assert result == values
+    assert size == len(msg)
+    assert DECODER_CACHE.info().misses == misses + 1
+
+    assert read_message(msg)[2] == values
+    assert DECODER_CACHE.info().hits == hits + 1
+
+
+def test_decode_values():
+    data = struct.pack('>iif', 1, 2, 3.5)
+    assert decode_values(b'iif', data) == ([1, 2, 3.5], 12)
+    assert decode_values(b'TiF', data, offset=4) == ([True, 2, False], 4)
+
+    with raises(ValueError):
+        decode_values(b'iH', data)
+
+
 def test_read_message_wrong_address():
     msg, stat = format_message(b'test', [])
     with raises(ValueError, match="doesn't start with a '/'") as e:
@@ -204,6 +295,120 @@ def test_read_bundle():
         assert (r[0], r[2]) == test[2]
 
 
+def test_read_message_lazy():
+    msg, stats = format_message(b'/lazy', [1, 2.5, b'test'])
+    message = read_message(msg, lazy=True)
+    assert isinstance(message, LazyMessage)
+    assert message.address == b'/lazy'
+    assert message.size == len(msg)
+    assert message._tags is None
+    assert message.tags == b'ifs'
+    assert message._values is None
+
+    assert message.values == [1, 2.5, b'test']
+    assert message.values is message.values
+
+    address, tags, values, size = message
+    assert (address, tags, values, size) == read_message(msg)
+
+
+def test_read_bundle_lazy():
+    bundle, stats = format_bundle((message_1[0], message_2[0]))
+    timetag, messages = read_bundle(bundle, lazy=True)
+    assert [m.address for m in messages] == [
+        b'/oscillator/4/frequency', b'/foo'
+    ]
+    assert all(m._tags is None and m._values is None for m in messages)
+    assert messages[1].values == message_2[2][1]
+    assert messages[0]._values is None
+
+    assert [tuple(m) for m in read_packet(bundle, lazy=True)] == [
+        tuple(m) for m in read_bundle(bundle)[1]
+    ]
+
+
+def test_read_message_lazy_broken_tags():
+    # invalid tag string is only detected when tags are accessed
+    s = b'/tmp\x00\x00\x00\x00\x00i\x00\x00\x00\x00\x00\x01'
+    message = read_message(s, lazy=True)
+    assert message.address == b'/tmp'
+    with raises(ValueError):
+        message.values
+
+
+def nest_bundles(timetag, elements):
+    """Build a bundle containing raw messages or bundles."""
+    bundle, stats = format_bundle([], timetag=timetag)
+    for element in elements:
+        bundle += struct.pack('>i', len(element)) + element
+    return bundle
+
+
+def test_iter_bundle_nested():
+    inner = nest_bundles(20.5, [
+        format_message(b'/inner', [2])[0],
+        nest_bundles(30.5, [format_message(b'/deep', [3])[0]]),
+    ])
+    bundle = nest_bundles(10.5, [
+        format_message(b'/outer', [1])[0],
+        inner,
+        format_message(b'/last', [4])[0],
+    ])
+
+    elements = list(iter_bundle(bundle))
+    assert [(t, m[0], m[2]) for t, m in elements] == [
+        (approx(10.5), b'/outer', [1]),
+        (approx(20.5), b'/inner', [2]),
+        (approx(30.5), b'/deep', [3]),
+        (approx(10.5), b'/last', [4]),
+    ]
+    assert elements[-1][1][3] == len(bundle)
+
+    lazy = [m for t, m in iter_bundle(bundle, lazy=True)]
+    assert [m.address for m in lazy] == [
+        b'/outer', b'/inner', b'/deep', b'/last'
+    ]
+    assert lazy[2].values == [3]
+
+    timetag, messages = read_bundle(bundle)
+    assert timetag == approx(10.5)
+    assert [m[0] for m in messages] == [
+        b'/outer', b'/inner', b'/deep', b'/last'
+    ]
+
+    # a generator: messages are available before the rest is parsed
+    broken = bundle[:-4]
+    elements = iter_bundle(broken)
+    assert next(elements)[1][0] == b'/outer'
+    with raises(ValueError):
+        list(elements)
+
+
+def test_iter_bundle_deeply_nested():
+    bundle = format_message(b'/deep', [1])[0]
+    for i in range(5000):
+        bundle = nest_bundles(None, [bundle])
+    bundle = nest_bundles(None, [bundle, format_message(b'/last', [2])[0]])
+
+    assert [m[0] for t, m in iter_bundle(bundle)] == [b'/deep', b'/last']
+
+
+def test_iter_packet():
+    msg = format_message(b'/test', [1])[0]
+    assert list(iter_packet(msg)) == [(None, (b'/test', b'i', [1], len(msg)))]
+
+    bundle = format_bundle([(b'/test', [1])])[0]
+    assert [t for t, m in iter_packet(bundle)] == [None]
+
+    now = time()
+    bundle = nest_bundles(now + 10, [
+        msg,
+        nest_bundles(now - 10, [format_message(b'/late', [])[0]]),
+    ])
+    assert [m[0] for t, m in iter_packet(bundle, drop_late=True)] == [b'/test']
+    assert len(read_packet(bundle)) == 2
+
+
 def test_read_packet():
     with raises(ValueError):
         read_packet(struct.pack('>%is' % len('test'), b'test'))
@@ -224,6 +429,69 @@ def tests_format_message_null_terminated_address():
         assert format_message(*source)[0] == msg
 
 
+def test_format_message_cache():
+    ENCODER_CACHE.clear()
+    info = ENCODER_CACHE.info()
+    msg, stats = format_message(b'/cached', [1, 2.0, b'test'])
+    assert ENCODER_CACHE.info().misses == info.misses + 1
+
+    msg2, stats2 = format_message(b'/cached', [3, 4.0, b'abcd'])
+    assert ENCODER_CACHE.info().hits == info.hits + 1
+    assert read_message(msg2)[2] == [3, 4.0, b'abcd']
+    assert stats == stats2
+
+    # a longer string is a different signature
+    msg3, stats3 = format_message(b'/cached', [3, 4.0, b'longer string'])
+    assert ENCODER_CACHE.info().misses == info.misses + 2
+    assert read_message(msg3)[2] == [3, 4.0, b'longer string']
+
+    # stats returned don't share the cached types counter
+    stats2.types['i'] += 10
+    assert format_message(b'/cached', [1, 2.0, b'test'])[1].types['i'] == 1
+
+
+def test_format_blob():
+    msg, stats = format_message(b'/blob', [bytearray(b'abcde')])
+    assert msg == b'/blob\0\0\0,b\0\0\0\0\0\x05abcde\0\0\0'
+    assert stats.types['b'] == 1
+
+
+def test_format_nil_message():
+    msg, stats = format_message(b'/nil', [None, 1])
+    assert read_message(msg)[1:3] == (b'Ni', [None, 1])
+
+
+def test_format_wide_types():
+    values = [2 ** 40, -2 ** 31 - 1, Int64(1), Double(1.1), 1.5,
+              RGBATuple(1, 2, 3, 4)]
+    msg, stats = format_message(b'/wide', values)
+    address, tags, result, size = read_message(msg)
+    assert tags == b'hhhdfr'
+    assert result == values
+    assert stats.types['h'] == 3
+
+    # the same class with a small value is a different signature
+    assert read_message(format_message(b'/wide', [1])[0])[1] == b'i'
+
+
+def test_format_arrays():
+    values = [1, [2.5, [b'test', 3], []], (4, 5)]
+    msg, stats = format_message(b'/arrays', values)
+    address, tags, result, size = read_message(msg)
+    assert tags == b'i[f[si][]][ii]'
+    assert result == [1, [2.5, [b'test', 3], []], [4, 5]]
+    assert size == len(msg)
+    assert stats.params == 6
+
+
+def test_read_broken_arrays():
+    with raises(ValueError):
+        decode_values(b'[i', struct.pack('>i', 1))
+
+    with raises(ValueError):
+        decode_values(b'i]', struct.pack('>i', 1))
+
+
 def test_format_true():
     assert format_true(True) == tuple()
 
@@ -271,6 +539,69 @@ def test_format_bundle():
     assert stats.types['s'] == 1
 
 
+def test_format_message_into():
+    buffer = bytearray(100)
+    size, stats = format_message_into(buffer, *message_2[0], offset=10)
+    msg = format_message(*message_2[0])[0]
+    assert size == len(msg)
+    assert buffer[10:10 + size] == msg
+    assert stats == format_message(*message_2[0])[1]
+
+    view = memoryview(buffer)
+    size, stats = format_message_into(view[60:], *message_1[0])
+    assert buffer[60:60 + size] == format_message(*message_1[0])[0]
+
+    with raises(ValueError):
+        format_message_into(buffer, *message_2[0], offset=90)
+    assert buffer[90:] == bytearray(10)
+
+
+def test_format_bundle_into():
+    buffer = bytearray(200)
+    data = (message_1[0], message_2[0])
+    size, stats = format_bundle_into(buffer, data, offset=4, timetag=1.5)
+    bundle, bundle_stats = format_bundle(data, timetag=1.5)
+    assert buffer[4:4 + size] == bundle
+    assert stats.calls == bundle_stats.calls == 2
+
+    timetag, messages = read_bundle(bytes(buffer[4:4 + size]))
+    assert timetag == approx(1.5)
+    assert [m[::2] for m in messages] == [message_1[2], message_2[2]]
+
+    with raises(ValueError):
+        format_bundle_into(bytearray(size - 1), data)
+
+
+def test_prepared_message():
+    prepared = PreparedMessage(b'/oscillator/4/frequency', b'f')
+    message, stats = prepared.format([440.0])
+    assert message == struct.pack('>%iB' % len(message_1[1]), *message_1[1])
+    assert stats == format_message(*message_1[0])[1]
+
+    prepared = PreparedMessage(u'/wide', u',ihdcTmr', encoding='utf8')
+    values = [1, 2 ** 40, 1.1, b'a', True, MidiTuple(0, 144, 72, 64),
+              RGBATuple(1, 2, 3, 4)]
+    message, stats = prepared.format(values)
+    address, tags, result, size = read_message(message)
+    assert address == b'/wide'
+    assert tags == b'ihdcTmr'
+    assert result == values
+    assert stats.params == 7
+
+    buffer = bytearray(prepared.size + 4)
+    assert prepared.format_into(buffer, values, offset=4)[0] == size
+    assert buffer[4:] == message
+
+    with raises(ValueError):
+        prepared.format_into(buffer, values, offset=8)
+
+    with raises(ValueError):
+        prepared.format([1])
+
+    with raises(ValueError):
+        PreparedMessage(b'/string', b's')
+
+
 def test_timetag():
     assert time_to_timetag(None) == (0, 1)
     assert time_to_timetag(0)[1] == 0
@@ -301,3 +632,66 @@ def test_format_encoding():
         format_message('/test', [s], encoding='utf8')[0],
         encoding='ascii', encoding_errors='replace'
     )[2][0] == u'������������'
+
+
+def test_format_numpy_array():
+    numpy = importorskip('numpy')
+    values = numpy.linspace(0, 1, 512, dtype=numpy.float32)
+    msg, stats = format_message(b'/spectrum', [1, values])
+    assert msg == format_message(b'/spectrum', [1] + values.tolist())[0]
+    assert stats.params == 513
+    assert stats.types['f'] == 512
+
+    ints = numpy.arange(-3, 3, dtype=numpy.int32)
+    msg, stats = format_message(b'/ints', [ints])
+    assert read_message(msg)[2] == ints.tolist()
+
+    with raises(TypeError):
+        format_message(b'/doubles', [numpy.zeros(3, dtype=numpy.int8)])
+
+    with raises(TypeError):
+        format_message(b'/2d', [numpy.zeros((3, 3), dtype=numpy.float32)])
+
+
+def test_format_numpy_array_subclass():
+    numpy = importorskip('numpy')
+
+    class Samples(numpy.ndarray):
+        pass
+
+    for size in (3, 5):
+        values = numpy.arange(size, dtype=numpy.float32).view(Samples)
+        msg, stats = format_message(b'/samples', [values])
+        assert read_message(msg)[2] == values.tolist()
+
+
+def test_read_numpy_arrays():
+    numpy = importorskip('numpy')
+    values = [1, 2.0, 3.0, 4.0, b'test', 5, 6]
+    msg, stats = format_message(b'/arrays', values)
+    address, tags, result, size = read_message(msg, numpy_arrays=True)
+    assert len(result) == 4
+    assert result[0] == 1
+    assert result[1].dtype == numpy.dtype('>f4')
+    assert result[1].tolist() == [2.0, 3.0, 4.0]
+    assert result[2] == b'test'
+    assert result[3].dtype == numpy.dtype('>i4')
+    assert result[3].tolist() == [5, 6]
+    assert size == len(msg)
+
+    # without the flag, the same tags are still decoded to python values
+    assert read_message(msg)[2] == values
+
+
+def test_numpy_wide_arrays():
+    numpy = importorskip('numpy')
+    doubles = numpy.linspace(0, 1, 10)
+    longs = numpy.arange(10, dtype=numpy.int64) * 2 ** 40
+    msg, stats = format_message(b'/wide', [doubles, longs])
+    address, tags, values, size = read_message(msg)
+    assert tags == b'd' * 10 + b'h' * 10
+    assert values == doubles.tolist() + longs.tolist()
+
+    values = read_message(msg, numpy_arrays=True)[2]
+    assert values[0].dtype == numpy.dtype('>f8')
+    assert values[1].tolist() == longs.tolist()
@@ -0,0 +1,170 @@
+import re
+from time import time
+
+from oscpy.routing import RouteTrie
+from oscpy.server import OSCThreadServer
+
+
+def make_trie():
+    return RouteTrie(OSCThreadServer()._convert_part_to_regex)
+
+
+def callbacks(routes):
+    return [callbacks for address, callbacks in routes]
+
+
+def test_literal_routes():
+    trie = make_trie()
+    a, b = [1], [2]
+    trie.add(b'/a/b', a)
+    trie.add(b'/a/c', b)
+
+    assert callbacks(trie.match(b'/a/b')) == [a]
+    assert callbacks(trie.match(b'/a/c')) == [b]
+    assert callbacks(trie.match(b'/a')) == []
+    assert callbacks(trie.match(b'/a/b/c')) == []
+    assert callbacks(trie.match(b'/b/b')) == []
+
+
+def test_literal_parts_are_exact():
+    trie = make_trie()
+    trie.add(b'/a.b', [1])
+    assert callbacks(trie.match(b'/a.b')) == [[1]]
+    assert callbacks(trie.match(b'/axb')) == []
+
+
+def test_pattern_routes():
+    trie = make_trie()
+    star, exact, choice = [1], [2], [3]
+    trie.add(b'/light/*/level', star)
+    trie.add(b'/light/1/level', exact)
+    trie.add(b'/light/{1,2}/level', choice)
+
+    assert callbacks(trie.match(b'/light/1/level')) == [star, exact, choice]
+    assert callbacks(trie.match(b'/light/2/level')) == [star, choice]
+    assert callbacks(trie.match(b'/light/3/level')) == [star]
+    assert callbacks(trie.match(b'/light/3/color')) == []
+
+
+def test_pattern_regex_chars_literal():
+    trie = make_trie()
+    dotted, ranged = [1], [2]
+    trie.add(b'/file/*.wav', dotted)
+    trie.add(b'/ch/[a-c]', ranged)
+
+    assert callbacks(trie.match(b'/file/kick.wav')) == [dotted]
+    assert callbacks(trie.match(b'/file/kick_wav')) == []
+    assert callbacks(trie.match(b'/ch/b')) == [ranged]
+    assert callbacks(trie.match(b'/ch/-')) == []
+
+
+def test_match_pattern_regex_chars_literal():
+    trie = make_trie()
+    gate, long = [1], [2]
+    trie.add(b'/synth/2/gate', gate, literal=True)
+    trie.add(b'/a/' + b'a' * 24, long, literal=True)
+
+    assert trie.match_pattern(b'/synth/1|*/gate') == []
+    assert callbacks(trie.match_pattern(b'/synth/{1,2}/gate')) == [gate]
+
+    # regex syntax is not interpreted, so can't backtrack for long
+    start = time()
+    assert trie.match_pattern(b'/a/(a+)+?!') == []
+    assert trie.match_pattern(b'/a/' + b'*' * 50 + b'b') == []
+    assert time() - start < 0.1
+
+
+def test_empty_routes_skipped():
+    trie = make_trie()
+    bound = []
+    trie.add(b'/a', bound)
+    assert trie.match(b'/a') == []
+    bound.append(1)
+    assert callbacks(trie.match(b'/a')) == [[1]]
+
+
+def test_pattern_compiled_once():
+    compiled = []
+
+    def compile_part(part):
+        compiled.append(part)
+        return re.compile(b'^.*$')
+
+    trie = RouteTrie(compile_part)
+    trie.add(b'/a/*', [1])
+    trie.add(b'/a/*', [2])
+    trie.add(b'/a/*/b', [3])
+    assert compiled == [b'*']
+    assert callbacks(trie.match(b'/a/x')) == [[1], [2]]
+    assert callbacks(trie.match(b'/a/x/b')) == [[3]]
+
+
+def test_match_pattern():
+    trie = make_trie()
+    gate1, gate2, level, star = [1], [2], [3], [4]
+    trie.add(b'/synth/1/gate', gate1, literal=True)
+    trie.add(b'/synth/2/gate', gate2, literal=True)
+    trie.add(b'/synth/1/level', level, literal=True)
+    trie.add(b'/synth/*/gate', star, literal=True)
+
+    assert trie.match_pattern(b'/synth/*/gate') == [
+        (b'/synth/1/gate', gate1),
+        (b'/synth/2/gate', gate2),
+        (b'/synth/*/gate', star),
+    ]
+    assert trie.match_pattern(b'/synth/1/*') == [
+        (b'/synth/1/gate', gate1),
+        (b'/synth/1/level', level),
+    ]
+    assert trie.match_pattern(b'/synth/{2,3}/gate') == [
+        (b'/synth/2/gate', gate2),
+    ]
+    assert trie.match_pattern(b'/synth/1/gate') == [
+        (b'/synth/1/gate', gate1),
+    ]
+    assert trie.match_pattern(b'/synth/3/*') == []
+
+
+def test_descendant_routes():
+    trie = make_trie()
+    level, deep, exact = [1], [2], [3]
+    trie.add(b'//level', level)
+    trie.add(b'/mixer//ch*/level', deep)
+    trie.add(b'/mixer/level', exact)
+
+    assert trie.match(b'/level') == [(b'//level', level)]
+    assert callbacks(trie.match(b'/mixer/level')) == [level, exact]
+    assert callbacks(trie.match(b'/mixer/bus/1/level')) == [level]
+    assert callbacks(trie.match(b'/mixer/bus/ch1/level')) == [level, deep]
+    assert callbacks(trie.match(b'/mixer/ch1/level')) == [level, deep]
+    assert trie.match(b'/mixer/ch1/gain') == []
+    assert trie.match(b'/level/gain') == []
+
+
+def test_trailing_slash_is_literal():
+    trie = make_trie()
+    trie.add(b'/a/', [1])
+    assert callbacks(trie.match(b'/a/')) == [[1]]
+    assert trie.match(b'/a/b') == []
+    assert trie.match(b'/a') == []
+
+
+def test_descendant_pattern():
+    trie = make_trie()
+    a, b, c = [1], [2], [3]
+    trie.add(b'/level', a, literal=True)
+    trie.add(b'/ch/1/level', b, literal=True)
+    trie.add(b'/ch/1/gain', c, literal=True)
+
+    assert callbacks(trie.match_pattern(b'//level')) == [a, b]
+    assert callbacks(trie.match_pattern(b'/ch//*')) == [b, c]
+    assert trie.match_pattern(b'//mute') == []
+
+
+def test_descendant_pattern_unique():
+    trie = make_trie()
+    a = [1]
+    trie.add(b'/a/a/b', a, literal=True)
+
+    assert callbacks(trie.match_pattern(b'//a//b')) == [a]
+    assert callbacks(trie.match_pattern(b'/a///b')) == [a]
@@ -453,6 +453,65 @@ def test_smart_address_match():
     assert not osc._match_address(address, b'/testtest/stuff')
 
 
+def test_smart_address_descendant():
+    osc = OSCThreadServer(advanced_matching=True)
+    sock = osc.listen(default=True)
+    assert osc.create_smart_address(b'//level')[1] is None
+
+    def level():
+        pass
+
+    def nested():
+        pass
+
+    def trailing():
+        pass
+
+    osc.bind(b'//level', level)
+    osc.bind(b'/a//b/*', nested)
+    osc.bind(b'/a/', trailing)
+
+    def bound(address):
+        return [
+            cb for callbacks in resolved(osc, sock, address)
+            for cb, _ in callbacks
+        ]
+
+    assert bound(b'/level') == [level]
+    assert bound(b'/a/level') == [level]
+    assert bound(b'/a/b/level') == [level, nested]
+    assert bound(b'/a/levels') == []
+    assert bound(b'/level/a') == []
+
+    assert bound(b'/a/b/c') == [nested]
+    assert bound(b'/a/x/y/b/c') == [nested]
+    assert bound(b'/a/b') == []
+    assert bound(b'/x/b/c') == []
+
+    assert bound(b'/a/') == [trailing]
+
+
+def test_advanced_matching_descendant():
+    osc = OSCThreadServer(advanced_matching=True)
+    osc.listen(default=True)
+    received = []
+
+    @osc.address(b'//level', get_address=True)
+    def level(address, value):
+        received.append((address, value))
+
+    send_message(b'/mixer/ch/1/level', [1], *osc.getaddress())
+    send_message(b'/level', [2], *osc.getaddress())
+
+    timeout = time() + 2
+    while len(received) < 2:
+        if time() > timeout:
+            raise OSError('timeout while waiting for success message.')
+        sleep(10e-9)
+
+    assert received == [(b'/mixer/ch/1/level', 1), (b'/level', 2)]
+
+
 def test_smart_address_cache():
     osc = OSCThreadServer(advanced_matching=True)
     assert osc.create_smart_address(b'/a') == osc.create_smart_address(b'/a')
@@ -931,6 +990,70 @@ def test_get_sender():
         sleep(10e-9)
 
 
+def test_get_context():
+    osc = OSCThreadServer()
+    sock = osc.listen(default=True)
+    contexts = []
+
+    @osc.address(b'/context')
+    def callback(*values):
+        contexts.append(osc.get_context())
+
+    with pytest.raises(RuntimeError,
+                       match=r'get_context\(\) not called from a callback'):
+        osc.get_context()
+
+    before = time()
+    send_message(b'/context', [1], *osc.getaddress())
+    send_bundle([(b'/context', [2])], *osc.getaddress(), timetag=1)
+
+    timeout = time() + 2
+    while len(contexts) < 2:
+        if time() > timeout:
+            raise OSError('timeout while waiting for success message.')
+        sleep(10e-9)
+
+    message, bundled = contexts
+    assert message.sock is sock
+    assert message.address == b'/context'
+    assert message.timetag is None
+    assert message.packet.startswith(b'/context\0')
+    assert before <= message.received <= time()
+    assert bundled.timetag == 1
+    assert bundled.packet.startswith(b'#bundle\0')
+    assert message.sender == bundled.sender
+
+
+def test_get_context_workers():
+    osc = OSCThreadServer(workers=2)
+    osc.listen(default=True)
+    senders = []
+
+    @osc.address(b'/sender')
+    def callback(value):
+        sleep(0.01)
+        senders.append((value, osc.get_sender()[2]))
+
+    clients = [OSCThreadServer() for i in range(2)]
+    for i, client in enumerate(clients):
+        client.listen(default=True)
+        client.send_message(b'/sender', [i], *osc.getaddress())
+
+    timeout = time() + 2
+    while len(senders) < 2:
+        if time() > timeout:
+            raise OSError('timeout while waiting for success message.')
+        sleep(10e-9)
+
+    # each message is answered to its own sender, even from the workers
+    assert sorted(senders) == [
+        (i, client.getaddress()[1]) for i, client in enumerate(clients)
+    ]
+    for client in clients:
+        client.stop_all()
+    osc.stop_all()
+
+
 def test_server_different_port():
     # used for storing values received by callback_3000
     checklist = []
@@ -1000,3 +1123,706 @@ def test_validate_message_address_disabled():
         if time() > timeout:
             raise OSError('timeout while waiting for success message.')
         sleep(10e-9)
+
+
+def test_zero_copy():
+    osc = OSCThreadServer(zero_copy=True)
+    osc.listen(default=True)
+
+    received = []
+
+    @osc.address(b'/blob')
+    def blob(data, value):
+        received.append((bytes(data), type(data), value))
+
+    send_message(b'/blob', [bytearray(b'abcdef'), 1], *osc.getaddress())
+
+    timeout = time() + 2
+    while not received:
+        if time() > timeout:
+            raise OSError('timeout while waiting for success message.')
+        sleep(10e-9)
+
+    assert received == [(b'abcdef', memoryview, 1)]
+
+
+def test_unbound_messages_not_decoded(caplog):
+    osc = OSCThreadServer()
+    sock = osc.listen(default=True)
+    received = []
+
+    @osc.address(b'/bound')
+    def bound(*values):
+        received.append(values)
+
+    # the int announced by the tags is missing, decoding would fail
+    client = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    client.sendto(b'/unbound\0\0\0\0,i\0\0', osc.getaddress())
+    send_message(b'/bound', [1, 2], *osc.getaddress())
+
+    timeout = time() + 2
+    while not received:
+        if time() > timeout:
+            raise OSError('timeout while waiting for success message.')
+        sleep(10e-9)
+
+    assert received == [(1, 2)]
+    assert not caplog.records
+    assert osc.stats_received.calls == 2
+    assert osc.stats_received.params == 2
+
+
+def test_deeply_nested_bundle():
+    osc = OSCThreadServer()
+    osc.listen(default=True)
+    received = []
+    osc.bind(b'/bound', received.append)
+
+    # immediate bundles nested 1500 times around a message
+    packet = b'/bound\0\0,i\0\0\0\0\0\1'
+    for i in range(1500):
+        packet = (
+            b'#bundle\0\0\0\0\0\0\0\0\1'
+            + len(packet).to_bytes(4, 'big') + packet
+        )
+
+    client = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    client.sendto(packet, osc.getaddress())
+    send_message(b'/bound', [2], *osc.getaddress())
+
+    timeout = time() + 2
+    while len(received) < 2:
+        if time() > timeout:
+            raise OSError('timeout while waiting for success message.')
+        sleep(10e-9)
+
+    assert received == [1, 2]
+    assert osc._thread.is_alive()
+    client.close()
+
+
+def test_array_stats():
+    osc = OSCThreadServer()
+    osc.listen(default=True)
+    received = []
+    osc.bind(b'/array', lambda *values: received.append(values))
+
+    sent = send_message(b'/array', [[1, 2], 3], *osc.getaddress())
+
+    timeout = time() + 2
+    while not received:
+        if time() > timeout:
+            raise OSError('timeout while waiting for success message.')
+        sleep(10e-9)
+
+    # brackets are not counted as values
+    assert received == [([1, 2], 3)]
+    assert osc.stats_received.params == sent.params == 3
+    assert sum(osc.stats_received.types.values()) == 3
+
+
+def test_schedule_bundles():
+    osc = OSCThreadServer(schedule_bundles=True, schedule_tolerance=0.005)
+    osc.listen(default=True)
+    received = []
+
+    @osc.address(b'/cue')
+    def cue(value):
+        received.append((value, time()))
+
+    sent = time()
+    send_bundle([(b'/cue', [2])], *osc.getaddress(), timetag=sent + 0.2)
+    send_bundle([(b'/cue', [1])], *osc.getaddress(), timetag=sent + 0.1)
+    send_bundle([(b'/cue', [0])], *osc.getaddress())
+
+    timeout = time() + 2
+    while len(received) < 3:
+        if time() > timeout:
+            raise OSError('timeout while waiting for success message.')
+        sleep(10e-9)
+
+    assert [value for value, _ in received] == [0, 1, 2]
+    assert received[1][1] >= sent + 0.1 - 0.005
+    assert received[2][1] >= sent + 0.2 - 0.005
+    assert osc.stats_dispatch['scheduled'] == 2
+    assert (
+        osc.stats_dispatch['early'] + osc.stats_dispatch['on_time']
+        + osc.stats_dispatch['late']
+    ) == 2
+
+
+def test_schedule_bundles_bounded():
+    osc = OSCThreadServer(schedule_bundles=True, max_scheduled=1)
+    osc.listen(default=True)
+    received = []
+
+    @osc.address(b'/cue')
+    def cue(value):
+        received.append(value)
+
+    timetag = time() + 0.1
+    send_bundle([(b'/cue', [1]), (b'/cue', [2])], *osc.getaddress(),
+                timetag=timetag)
+
+    timeout = time() + 2
+    while not received:
+        if time() > timeout:
+            raise OSError('timeout while waiting for success message.')
+        sleep(10e-9)
+
+    sleep(0.05)
+    assert received == [1]
+    assert osc.stats_dispatch['overflow'] == 1
+
+
+def test_late_bundles_counted():
+    osc = OSCThreadServer()
+    osc.listen(default=True)
+    received = []
+
+    @osc.address(b'/cue')
+    def cue(value):
+        received.append(value)
+
+    send_bundle([(b'/cue', [1])], *osc.getaddress(), timetag=time() - 1)
+    send_bundle([(b'/cue', [2])], *osc.getaddress(), timetag=time() + 1)
+
+    timeout = time() + 2
+    while len(received) < 2:
+        if time() > timeout:
+            raise OSError('timeout while waiting for success message.')
+        sleep(10e-9)
+
+    assert received == [1, 2]
+    assert osc.stats_dispatch['late'] == 1
+    assert osc.stats_dispatch['early'] == 1
+    assert not osc.stats_dispatch['scheduled']
+
+
+def resolved(osc, sock, address):
+    return [
+        callbacks for _, callbacks in osc._resolve_callbacks(sock, address)
+    ]
+
+
+def test_advanced_matching_unbind():
+    osc = OSCThreadServer(advanced_matching=True)
+    sock = osc.listen(default=True)
+    received = []
+
+    def first(*values):
+        received.append(1)
+
+    def second(*values):
+        received.append(2)
+
+    osc.bind(b'/light/*', first)
+    osc.bind(b'/light/1', second)
+    osc.bind(b'/light/?', first)
+    assert resolved(osc, sock, b'/light/1') == [
+        [(first, False)], [(second, False)], [(first, False)]
+    ]
+
+    osc.unbind(b'/light/*', first)
+    assert resolved(osc, sock, b'/light/1') == [
+        [(second, False)], [(first, False)]
+    ]
+    assert resolved(osc, sock, b'/light/12') == []
+
+    send_message(b'/light/1', [], *osc.getaddress())
+    timeout = time() + 2
+    while len(received) < 2:
+        if time() > timeout:
+            raise OSError('timeout while waiting for success message.')
+        sleep(10e-9)
+
+    assert received == [2, 1]
+
+
+def test_advanced_matching_cache():
+    osc = OSCThreadServer(advanced_matching=True)
+    sock = osc.listen(default=True)
+
+    def first(*values):
+        pass
+
+    def second(*values):
+        pass
+
+    osc.bind(b'/light/*', first)
+    assert resolved(osc, sock, b'/light/1') == [[(first, False)]]
+    assert resolved(osc, sock, b'/light/1') == [[(first, False)]]
+    assert osc._match_caches[sock].info().hits == 1
+
+    osc.bind(b'/light/1', second)
+    assert sock not in osc._match_caches
+    assert resolved(osc, sock, b'/light/1') == [
+        [(first, False)], [(second, False)]
+    ]
+
+    osc.unbind(b'/light/*', first)
+    assert resolved(osc, sock, b'/light/1') == [[(second, False)]]
+
+    osc = OSCThreadServer(advanced_matching=True, match_cache_size=0)
+    sock = osc.listen(default=True)
+    osc.bind(b'/light/*', first)
+    assert resolved(osc, sock, b'/light/1') == [[(first, False)]]
+    assert not osc._match_caches
+
+
+def test_incoming_patterns():
+    osc = OSCThreadServer(incoming_patterns=True)
+    osc.listen(default=True)
+    received = []
+
+    def gate(address, *values):
+        received.append((address, values))
+
+    def level(*values):
+        received.append(values)
+
+    for i in range(3):
+        osc.bind('/synth/{}/gate'.format(i).encode(), gate, get_address=True)
+    osc.bind(b'/synth/0/level', level)
+
+    send_message(b'/synth/[!0]/gate', [1], *osc.getaddress())
+    send_message(b'/synth/0/*', [2], *osc.getaddress())
+    send_message(b'/synth/0/level', [3], *osc.getaddress())
+
+    timeout = time() + 2
+    while len(received) < 5:
+        if time() > timeout:
+            raise OSError('timeout while waiting for success message.')
+        sleep(10e-9)
+
+    assert received == [
+        (b'/synth/1/gate', (1,)),
+        (b'/synth/2/gate', (1,)),
+        (b'/synth/0/gate', (2,)),
+        (2,),
+        (3,),
+    ]
+
+
+def test_incoming_patterns_invalid(caplog):
+    osc = OSCThreadServer(incoming_patterns=True)
+    osc.listen(default=True)
+    received = []
+    osc.bind(b'/a/b', received.append)
+
+    send_message(b'/a/[', [1], *osc.getaddress())
+    send_message(b'/a/b', [2], *osc.getaddress())
+
+    timeout = time() + 2
+    while not received:
+        if time() > timeout:
+            raise OSError('timeout while waiting for success message.')
+        sleep(10e-9)
+
+    # the invalid pattern was logged, and didn't stop the server
+    assert received == [2]
+    assert osc._thread.is_alive()
+    assert 'invalid address pattern' in caplog.text
+
+
+def test_incoming_patterns_cache_bounded():
+    osc = OSCThreadServer(incoming_patterns=True, match_cache_size=8)
+    osc.listen(default=True)
+    received = []
+    osc.bind(b'/a/b', received.append)
+
+    for i in range(20):
+        send_message(
+            '/a/{{b,{}}}'.format(i).encode(), [i], *osc.getaddress())
+
+    timeout = time() + 2
+    while len(received) < 20:
+        if time() > timeout:
+            raise OSError('timeout while waiting for success message.')
+        sleep(10e-9)
+
+    assert len(osc._pattern_part_cache) <= 8
+    assert b'{b,0}' not in osc._smart_part_cache
+
+
+def test_incoming_patterns_exclusive():
+    with pytest.raises(ValueError):
+        OSCThreadServer(advanced_matching=True, incoming_patterns=True)
+
+
+def test_workers():
+    osc = OSCThreadServer(workers=2)
+    osc.listen(default=True)
+    received = []
+    # an address handled by the other worker, as it's chosen by hash
+    fast_address = next(
+        address for address in (b'/fast%i' % i for i in range(100))
+        if hash(address) % 2 != hash(b'/slow') % 2
+    )
+
+    @osc.address(b'/slow')
+    def slow(value):
+        sleep(0.1)
+        received.append((b'/slow', value))
+
+    @osc.address(fast_address)
+    def fast(value):
+        received.append((fast_address, value))
+        osc.answer(b'/answer', [value])
+
+    client = OSCThreadServer()
+    client.listen(default=True)
+    answers = []
+    client.bind(b'/answer', answers.append)
+
+    client.send_message(b'/slow', [1], *osc.getaddress())
+    client.send_message(b'/slow', [2], *osc.getaddress())
+    for i in range(10):
+        client.send_message(fast_address, [i], *osc.getaddress())
+
+    timeout = time() + 2
+    while len(received) < 12:
+        if time() > timeout:
+            raise OSError('timeout while waiting for success message.')
+        sleep(10e-9)
+
+    slow_values = [v for a, v in received if a == b'/slow']
+    fast_values = [v for a, v in received if a == fast_address]
+    assert slow_values == [1, 2]
+    assert fast_values == list(range(10))
+    # the slow callback didn't block the other address
+    assert received[0][0] == fast_address
+
+    while len(answers) < 10:
+        if time() > timeout:
+            raise OSError('timeout while waiting for answers.')
+        sleep(10e-9)
+    assert sorted(answers) == list(range(10))
+    assert not osc.stats_dispatch['rejected']
+
+
+@pytest.mark.filterwarnings(
+    'ignore::pytest.PytestUnhandledThreadExceptionWarning'
+)
+def test_workers_error_stops_server():
+    osc = OSCThreadServer(workers=1, intercept_errors=False)
+    osc.listen(default=True)
+
+    @osc.address(b'/error')
+    def error():
+        raise ZeroDivisionError
+
+    send_message(b'/error', [], *osc.getaddress())
+
+    # the listening thread is woken up, rather than waiting for a message
+    assert osc.join_server(timeout=1)
+    osc.stop_all()
+    # let the worker thread end while its warning is filtered
+    sleep(0.1)
+
+
+def test_workers_rejected():
+    osc = OSCThreadServer(workers=1, worker_queue_size=1)
+    osc.listen(default=True)
+    received = []
+
+    @osc.address(b'/slow')
+    def slow(value):
+        sleep(0.1)
+        received.append(value)
+
+    for i in range(5):
+        send_message(b'/slow', [i], *osc.getaddress())
+
+    timeout = time() + 2
+    while osc.stats_received.calls < 5:
+        if time() > timeout:
+            raise OSError('timeout while waiting for success message.')
+        sleep(10e-9)
+
+    assert osc.queue_depth() <= 1
+    sleep(0.3)
+    assert osc.queue_depth() == 0
+    assert osc.stats_dispatch['rejected'] == 5 - len(received)
+    assert received[0] == 0
+
+
+def square(value):
+    return value * value
+
+
+def add_address(address, value):
+    return [address, value + 1]
+
+
+def test_bind_process():
+    osc = OSCThreadServer(processes=2)
+    osc.listen(default=True)
+    osc.bind(b'/square', square, process=True, answer_address=b'/squared')
+    osc.bind(
+        b'/add', add_address, process=True, answer_address=b'/added',
+        get_address=True
+    )
+
+    received = []
+
+    @osc.address(b'/add')
+    def add(value):
+        received.append(value)
+
+    client = OSCThreadServer()
+    client.listen(default=True)
+    answers = []
+    client.bind(b'/squared', lambda value: answers.append(value))
+    client.bind(b'/added', lambda *values: answers.append(values))
+
+    client.send_message(b'/square', [3], *osc.getaddress())
+    client.send_message(b'/add', [4], *osc.getaddress())
+
+    timeout = time() + 5
+    while len(answers) < 2:
+        if time() > timeout:
+            raise OSError('timeout while waiting for answers.')
+        sleep(10e-9)
+
+    assert sorted(answers, key=str) == [(b'/add', 5), 9]
+    assert received == [4]
+
+    osc.unbind(b'/square', square)
+    assert not osc.addresses[(osc.default_socket, b'/square')]
+    osc.terminate_server()
+
+
+def test_batches():
+    osc = OSCThreadServer(max_batch=4)
+    osc.listen(default=True)
+    received = []
+
+    @osc.address(b'/value')
+    def value(value):
+        if not received:
+            # let the other messages accumulate
+            sleep(0.1)
+        received.append(value)
+
+    for i in range(11):
+        send_message(b'/value', [i], *osc.getaddress())
+
+    timeout = time() + 2
+    while len(received) < 11:
+        if time() > timeout:
+            raise OSError('timeout while waiting for success message.')
+        sleep(10e-9)
+
+    batches = osc.stats_batches
+    assert received == list(range(11))
+    assert sum(size * count for size, count in batches.items()) == 11
+    assert max(batches) == 4
+
+
+def test_wakeup():
+    osc = OSCThreadServer()
+    assert osc.timeout is None
+
+    # sockets added after the thread started waiting are listened to
+    sockets = [osc.listen() for i in range(100)]
+    received = []
+    for sock in sockets:
+        osc.bind(b'/ping', received.append, sock=sock)
+
+    for sock in sockets[::10]:
+        send_message(b'/ping', [1], *osc.getaddress(sock))
+
+    timeout = time() + 2
+    while len(received) < 10:
+        if time() > timeout:
+            raise OSError('timeout while waiting for success message.')
+        sleep(10e-9)
+
+    osc.stop(sockets[0])
+    assert sockets[0] not in osc.sockets
+
+    start = time()
+    osc.terminate_server()
+    assert osc.join_server(timeout=1)
+    assert time() - start < 0.5
+    osc.stop_all()
+
+
+@pytest.mark.skipif(
+    not platform.startswith('linux'), reason='SO_RXQ_OVFL is linux only'
+)
+def test_track_drops():
+    osc = OSCThreadServer()
+    sock = osc.listen(default=True, recv_buffer_size=4096, track_drops=True)
+    assert sock.getsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF) <= 16384
+    received = []
+
+    @osc.address(b'/value')
+    def value(value):
+        if not received:
+            # let the buffer overflow
+            sleep(0.2)
+        received.append(value)
+
+    client = OSCThreadServer()
+    client.listen(default=True)
+    answers = []
+    client.bind(b'/_oscpy/stats/dropped/answer', answers.append)
+
+    sent = 200
+    for i in range(sent):
+        send_message(b'/value', [i], *osc.getaddress())
+
+    sleep(0.3)
+    # the drops counter is given with the next received datagram
+    client.send_message(
+        b'/_oscpy/stats/dropped', [client.getaddress()[1]], *osc.getaddress()
+    )
+
+    timeout = time() + 2
+    while not answers:
+        if time() > timeout:
+            raise OSError('timeout while waiting for answers.')
+        sleep(10e-9)
+
+    dropped = osc.stats_received.dropped
+    assert dropped > 0
+    assert answers == [dropped]
+    assert len(received) + dropped == sent
+
+
+def test_recv_buffer_size():
+    osc = OSCThreadServer()
+    sock = osc.listen(recv_buffer_size=65536)
+    assert sock.getsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF) >= 65536
+
+    # falls back to SO_RCVBUF without the required privileges
+    sock = osc.listen(recv_buffer_size=32768, force_recv_buffer=True)
+    assert sock.getsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF) >= 32768
+
+
+def test_coalesce():
+    osc = OSCThreadServer()
+    osc.listen(default=True)
+    blocked = []
+    latest = []
+    every = []
+
+    @osc.address(b'/block')
+    def block():
+        # let the other messages accumulate
+        sleep(0.1)
+        blocked.append(True)
+
+    osc.bind(b'/fader', latest.append, coalesce=True)
+    osc.bind(b'/fader', every.append)
+    osc.bind(b'/other', latest.append, coalesce=True)
+
+    send_message(b'/block', [], *osc.getaddress())
+    for i in range(20):
+        send_message(b'/fader', [i], *osc.getaddress())
+    send_message(b'/other', [-1], *osc.getaddress())
+
+    timeout = time() + 2
+    while len(latest) < 2:
+        if time() > timeout:
+            raise OSError('timeout while waiting for success message.')
+        sleep(10e-9)
+
+    assert blocked
+    assert latest == [19, -1]
+    assert every == list(range(20))
+    assert osc.stats_dispatch['superseded'] == 19
+
+    # unbound using the original callback
+    osc.unbind(b'/fader', latest.append)
+    send_message(b'/fader', [20], *osc.getaddress())
+    while len(every) < 21:
+        if time() > timeout:
+            raise OSError('timeout while waiting for success message.')
+        sleep(10e-9)
+    assert latest == [19, -1]
+
+
+def test_max_rate():
+    osc = OSCThreadServer()
+    osc.listen(default=True)
+    received = []
+    osc.bind(b'/rate', received.append, max_rate=5)
+
+    for i in range(20):
+        send_message(b'/rate', [i], *osc.getaddress())
+
+    timeout = time() + 2
+    while sum(osc.stats_dispatch.values()) + len(received) < 20:
+        if time() > timeout:
+            raise OSError('timeout while waiting for success message.')
+        sleep(10e-9)
+
+    assert received[0] == 0
+    assert len(received) + osc.stats_dispatch['throttled'] == 20
+    assert len(received) < 5
+
+    # throttled messages are not decoded
+    assert osc.stats_received.calls == 20
+    assert osc.stats_received.params == len(received)
+
+    sleep(0.2)
+    send_message(b'/rate', [20], *osc.getaddress())
+    while received[-1] != 20:
+        if time() > timeout:
+            raise OSError('timeout while waiting for success message.')
+        sleep(10e-9)
+
+    with pytest.raises(ValueError):
+        osc.bind(b'/rate', print, max_rate=-1)
+
+
+def test_max_rate_per_sender():
+    osc = OSCThreadServer()
+    osc.listen(default=True)
+    received = []
+
+    @osc.address(b'/rate', max_rate=1, per_sender=True, burst=2)
+    def rate(value):
+        received.append(value)
+
+    clients = [OSCThreadServer() for i in range(2)]
+    for i, client in enumerate(clients):
+        client.listen(default=True)
+        for j in range(5):
+            client.send_message(b'/rate', [i], *osc.getaddress())
+
+    timeout = time() + 2
+    while osc.stats_dispatch['throttled'] + len(received) < 10:
+        if time() > timeout:
+            raise OSError('timeout while waiting for success message.')
+        sleep(10e-9)
+
+    # each sender has its own bucket, allowing 2 calls in a row
+    assert sorted(received) == [0, 0, 1, 1]
+    for client in clients:
+        client.stop_all()
+    osc.stop_all()
+
+
+def test_max_rate_coalesce():
+    osc = OSCThreadServer()
+    osc.listen(default=True)
+    received = []
+    osc.bind(b'/fader', received.append, max_rate=20, coalesce=True)
+
+    for i in range(10):
+        send_message(b'/fader', [i], *osc.getaddress())
+
+    timeout = time() + 2
+    while not received or received[-1] != 9:
+        if time() > timeout:
+            raise OSError('timeout while waiting for success message.')
+        sleep(10e-9)
+
+    # the latest message was kept until the callback could be called
+    assert len(received) <= 3
+    assert not osc.stats_dispatch['throttled']
+    assert osc.stats_dispatch['superseded'] == 10 - len(received)
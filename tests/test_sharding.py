@@ -0,0 +1,70 @@
+import os
+import socket
+from time import time, sleep
+
+import pytest
+
+from oscpy.server import OSCThreadServer
+from oscpy.sharding import ShardedServer, resolve_setup
+from oscpy.client import send_message
+
+
+pytestmark = pytest.mark.skipif(
+    not hasattr(socket, 'SO_REUSEPORT'), reason='SO_REUSEPORT not available'
+)
+
+
+def setup(server):
+    @server.address(b'/ping')
+    def ping(port):
+        server.answer(b'/pong', [os.getpid()], port=port)
+
+
+def test_resolve_setup():
+    assert resolve_setup(setup) is setup
+    assert resolve_setup('test_sharding:setup') is setup
+    assert resolve_setup('test_sharding') is setup
+
+
+def test_listen_reuse_port():
+    osc_1 = OSCThreadServer()
+    sock = osc_1.listen(reuse_port=True)
+    osc_2 = OSCThreadServer()
+    osc_2.listen(port=sock.getsockname()[1], reuse_port=True)
+
+    with pytest.raises(ValueError):
+        osc_1.listen(
+            address='/tmp/oscpy_reuse', family='unix', reuse_port=True)
+
+
+def test_sharded_server():
+    client = OSCThreadServer()
+    client.listen(default=True)
+    client_port = client.getaddress()[1]
+    pids = []
+    client.bind(b'/pong', pids.append)
+
+    with ShardedServer(setup, processes=2, stats_interval=.05) as shards:
+        address, port = shards.getaddress()
+        assert port
+
+        # the system spreads messages among the processes by sender
+        senders = [
+            socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+            for i in range(20)
+        ]
+        for sock in senders:
+            send_message(b'/ping', [client_port], address, port, sock=sock)
+
+        timeout = time() + 5
+        while len(pids) < 20:
+            if time() > timeout:
+                raise OSError('timeout while waiting for answers.')
+            sleep(10e-9)
+
+    assert len(set(pids)) == 2
+    assert os.getpid() not in pids
+    stats = shards.stats_received
+    assert stats.calls == 20
+    assert stats.params == 20
+    assert sum(s.calls for s in shards.stats_by_process().values()) == 20
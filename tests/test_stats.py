@@ -48,3 +48,13 @@ def test_repr_stats():
             b: 1
             c: 1
     ''').strip()
+
+
+def test_dropped_stats():
+    stats = Stats(calls=1, dropped=2)
+    stats += Stats(dropped=3)
+    assert stats.dropped == 5
+    assert (stats + Stats(dropped=1)).dropped == 6
+    assert stats.to_tuple() == (1, 0, 0, '')
+    assert stats != Stats(calls=1)
+    assert repr(stats).endswith('    dropped: 5')